@@ -4,7 +4,7 @@ import pygame
 
 from game.entities.enemy import Enemy
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 from utils.constants import NPC_SIZE
 from utils.paths.assets_paths import ENEMY_ASSETS
 
@@ -21,7 +21,7 @@ class Civilian(Enemy):
         #    1. ~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~        VISUALS        ~~
         #    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self._sprite_sheet = SpriteSheet(ENEMY_ASSETS, 10, 33, NPC_SIZE * 1.8)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(ENEMY_ASSETS, 10, 33, NPC_SIZE * 1.8)
         self._animation_frames = 4
         self._animation_start = 130
         self._idle_frames = 2
@@ -82,7 +82,7 @@ class Civilian(Enemy):
             self.ray_reach = 2
             self.ray_radius = self.ray_reach * self.grid.gap
 
-            if self.next_point is None or self.end_node.compare_node(current_node):
+            if not self.awaiting_path() and (self.next_point is None or self.end_node.compare_node(current_node)):
                 next_node = self.grid.get_random_node_from_zone(current_node.get_id())
                 self.set_path(node=next_node)
 
@@ -4,7 +4,7 @@ import pygame
 
 from game.entities.enemy import Enemy
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 from utils.constants import NPC_SIZE
 from utils.paths.assets_paths import NPC_ASSETS
 
@@ -21,7 +21,7 @@ class Guard(Enemy):
         #    1. ~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~ CHASING RELATED VARS  ~~
         #    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self._sprite_sheet = SpriteSheet(NPC_ASSETS, 10, 13, NPC_SIZE * 2)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(NPC_ASSETS, 10, 13, NPC_SIZE * 2)
         self._animation_frames = 4
         self._animation_start = 100
         self._idle_frames = 2
@@ -70,8 +70,9 @@ class Guard(Enemy):
             self.vision_timer = max(0, self.vision_timer - 1)
             self.chase_node = self.grid.get_node((self.player.x, self.player.y))
 
-            # Simplified version to avoid slow turnings
-            self.set_simplified_path(self.chase_node, 4)
+            # Every guard chasing the player follows the same flow field, so the patrol path requested is dropped
+            self.cancel_path()
+            self.follow_flow(self.chase_node)
 
         else:
             self.speed = 1
@@ -79,7 +80,7 @@ class Guard(Enemy):
             self.ray_reach = 6
             self.ray_radius = self.ray_reach * self.grid.gap
 
-            if self.next_point is None or self.end_node.compare_node(current_node):
+            if not self.awaiting_path() and (self.next_point is None or self.end_node.compare_node(current_node)):
                 self.set_path()
 
         super().update(**kwargs)
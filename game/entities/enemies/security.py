@@ -60,17 +60,20 @@ class Security(Enemy):
             self.chase_node = self.grid.get_node((self.player.x, self.player.y))
 
             if self.next_point is None or self.chase_node.compare_node(current_node):
-                next_node = self.grid.get_random_node_from_zone(current_node.get_id())
-                self.set_path(next_node)
-            elif self.has_reached(self.next_point):
-                self.set_next_point()
-                # Simplified version to avoid slow turnings
-                self.set_simplified_path(self.chase_node, 2)
+                # On the square of the player, it wanders around the zone, waiting for the path it requested
+                if not self.awaiting_path():
+                    next_node = self.grid.get_random_node_from_zone(current_node.get_id())
+                    self.set_path(next_node)
+            else:
+                # The player moved on, so the path requested to wander around is no longer wanted
+                self.cancel_path()
+                # Every enemy chasing the player follows the same flow field
+                self.follow_flow(self.chase_node)
         else:
-            if self.next_point is None or self.end_node.compare_node(current_node):
+            if not self.awaiting_path() and (self.next_point is None or self.end_node.compare_node(current_node)):
                 next_node = self.grid.get_random_node_from_zone(current_node.get_id())
                 self.set_path(next_node)
-            elif self.has_reached(self.next_point):
+            elif self.next_point is not None and self.has_reached(self.next_point):
                 self.set_next_point()
 
         super().update(**kwargs)
@@ -53,7 +53,8 @@ class Sentinel(Enemy):
                 possible_nodes.append(player_node)
                 self.chase_node = random.choice(possible_nodes)
                 self.previous_node = self.grid.get_node((self.x, self.y))
-                self.set_path(self.chase_node)
+                # The path leads to the player along the flow field shared with the other enemies
+                self.set_flow_path(self.chase_node, player_node)
 
     def update(self, **kwargs):
 
@@ -76,9 +77,9 @@ class Sentinel(Enemy):
             self.ray_reach = 4
             self.ray_radius = self.ray_reach * self.grid.gap
 
-            if self.next_point is None or self.end_node.compare_node(current_node):
+            if not self.awaiting_path() and (self.next_point is None or self.end_node.compare_node(current_node)):
                 self.set_path()
-            elif self.has_reached(self.next_point):
+            elif self.next_point is not None and self.has_reached(self.next_point):
                 self.set_next_point()
         super().update(**kwargs)
 
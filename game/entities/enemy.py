@@ -9,7 +9,7 @@ from pygame import Surface
 import queue
 
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 from utils.algorithms import *
 from utils.auxiliar import *
 from utils.constants import *
@@ -40,10 +40,11 @@ class Enemy(pygame.sprite.Sprite):
         self.offset = VIEW_OFFSET * (NPC_SIZE / 20)
         self.image = pygame.Surface((NPC_SIZE, NPC_SIZE))
         self.image.fill((0, 0, 0))
+        self._flipped_image = self.image  # The current frame facing the other way, taken from the sprite sheet
         self.rect = self.image.get_rect()
         self.rect.center = (self.x, self.y)
 
-        self._sprite_sheet = SpriteSheet(ENEMY_ASSETS, 10, 33, NPC_SIZE * 2)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(ENEMY_ASSETS, 10, 33, NPC_SIZE * 2)
         self._animation_frames = 4
         self._animation_start = 0
         self._idle_frames = 4
@@ -75,6 +76,8 @@ class Enemy(pygame.sprite.Sprite):
         self.path_nodes = []
         self.path_points = []
         self.next_point = None
+        self._path_future = None  # The path being searched by the scheduler of the grid
+        self._path_options = ((None, None, 8), True)  # The start, end, segments and simplification of the request
 
         # 4. ~~~~~~~~~~~~~~~~~~~~~~~~~~~
         #    ~~ RAY CASTING AND VISION ~~
@@ -93,6 +96,9 @@ class Enemy(pygame.sprite.Sprite):
         self._status = GREEN
 
     def draw(self, center, **kwargs):
+        blit_all(kwargs.get('internal_surface'), self.draw_commands(center, **kwargs))
+
+    def draw_commands(self, center, **kwargs):
         surface = kwargs.pop('internal_surface', None)
         if surface is not None:
             if not isinstance(surface, Surface):
@@ -104,7 +110,7 @@ class Enemy(pygame.sprite.Sprite):
                 raise TypeError("offset must be an instance of Vector2 class")
 
         if not self.in_range(surface, center, self.size * 2):
-            return
+            return []
 
         if is_looking_right(self.angle):
             self._looking_right = True
@@ -115,12 +121,10 @@ class Enemy(pygame.sprite.Sprite):
         sprite_rect.centerx = self.rect.centerx
         sprite_rect.bottom = self.rect.bottom - 10
 
-        flipped_image = pygame.transform.flip(self.image, not self._looking_right, False)
-
-        surface.blit(
-            source=flipped_image,
-            dest=(sprite_rect.x - offset.x, sprite_rect.y - offset.y)
-        )
+        return [(
+            self.image if self._looking_right else self._flipped_image,
+            (sprite_rect.x - offset.x, sprite_rect.y - offset.y)
+        )]
 
     def in_range(self, surface, center, padding):
 
@@ -131,6 +135,7 @@ class Enemy(pygame.sprite.Sprite):
                 vertical_distance < surface.get_height() // 2 + padding)
 
     def update(self, **kwargs):
+        self.receive_path()
 
         #################################
         # DRAWING PATH (OPTIONAL)
@@ -168,6 +173,8 @@ class Enemy(pygame.sprite.Sprite):
 
                 self.delta_x = -math.cos(math.radians(self.angle)) * self.offset
                 self.delta_y = math.sin(math.radians(self.angle)) * self.offset
+        elif end_point is None:
+            self._is_moving = False  # Waiting for the path requested to arrive
         else:
             self._is_moving = True
             iteration_count = 0
@@ -194,15 +201,12 @@ class Enemy(pygame.sprite.Sprite):
 
         if self._is_moving:
             self._current_frame %= self._animation_frames  # Ensure frame counter wraps around
-            self.image = self._sprite_sheet.get_sprite_by_number(self._animation_start + int(self._current_frame))
+            frame = self._animation_start + int(self._current_frame)
         else:
             self._current_frame %= self._idle_frames  # Ensure frame counter wraps around
-            self.image = self._sprite_sheet.get_sprite_by_number(self._idle_start + int(self._current_frame))
-
-        ##############################
-        # CASTING RAYS
-        ##############################
-        self.cast()
+            frame = self._idle_start + int(self._current_frame)
+        self.image = self._sprite_sheet.get_sprite_by_number(frame)
+        self._flipped_image = self._sprite_sheet.get_sprite_by_number(frame, flipped=True)
 
         # Update sprite
         self.rect.center = (self.x, self.y)
@@ -236,22 +240,64 @@ class Enemy(pygame.sprite.Sprite):
     # ####################################################################### #
 
     def pathfinding(self, end=None, interpolation=8, simplified=True):
-        try:
-            self.set_start()
-            if end is not None:
-                self.end_node = end
-            else:
-                self.set_random_end()
-            self.set_intermediate_points(self.a_star(), interpolation, simplified)
-        except Exception as e:
-            print(e)
-            print(self.path_nodes)
+        self.set_start()
+        if end is not None:
+            self.end_node = end
+        else:
+            self.set_random_end()
+
+        key = (self.start_node.index, self.end_node.index, 8 if interpolation is None else interpolation)
+        path = self.grid.path_cache.get(*key)
+        if path is not None:
+            # A path already smoothed is set again at once, replacing any earlier request
+            self.cancel_path()
+            nodes, points = path
+            self.path_nodes = list(nodes)
+            self.set_points(list(points), simplified)
+            return
+
+        # The current path is followed until the scheduler of the grid answers, replacing any earlier request
+        future = self.grid.path_scheduler.request(self.start_node.index, self.end_node.index)
+        self.cancel_path()
+        self._path_future = future
+        self._path_options = (key, simplified)
+
+    def receive_path(self):
+        if self._path_future is None or not self._path_future.done():
+            return
+
+        future, self._path_future = self._path_future, None
+        path = future.result()
+        if len(path) < 2:
+            return  # The end cannot be reached or has already been, so the current path is kept
+
+        (start, end, segments), simplified = self._path_options
+        nodes = [self.grid.node_at(index) for index in path]
+        self.path_nodes = list(nodes)
+        points = self.interpolate_points(segments)
+        self.set_points(list(points), simplified)
+        self.grid.path_cache.put(start, end, segments, (nodes, points))
+
+    def awaiting_path(self):
+        return self._path_future is not None
+
+    def cancel_path(self):
+        """
+        Give up on the path requested from the scheduler of the grid, once it is no longer wanted.
+        """
+        if self._path_future is not None:
+            (start, end, _), _ = self._path_options
+            self.grid.path_scheduler.withdraw(start, end, self._path_future)
+            self._path_future = None
 
     def set_intermediate_points(self, nodes, segments, simplified):
         if segments is None:
             segments = 8
         self.path_nodes = nodes
-        self.path_points = self.interpolate_points(segments)
+        self.set_points(self.interpolate_points(segments), simplified)
+
+    def set_points(self, points, simplified):
+        self.path_points = points
         self.next_point = self.path_points[1]
         self.path_nodes.pop(0)
         self.path_points.pop(0)
@@ -340,42 +386,52 @@ class Enemy(pygame.sprite.Sprite):
 
         return point_list
 
+    def follow_flow(self, node, steps=2):
+        """
+        Head for a square along the flow field of the grid, which is shared by every enemy chasing it.
+
+        Args:
+            node (Square): The square to reach.
+            steps (int, optional): The number of squares of the path set ahead. Defaults to 2.
+        """
+        current = self.grid.get_node((self.x, self.y)).index
+        self.path_nodes = []
+        for _ in range(steps):
+            current = self.grid.flow_field.next_step(current, node.index)
+            self.path_nodes.append(self.grid.node_at(current))
+
+        self.end_node = node
+        self.path_points = [square.get_pos() for square in self.path_nodes]
+        self.next_point = self.path_points[0]
+
+    def set_flow_path(self, node, target=None, segments=8):
+        """
+        Set a smoothed path to a square along the flow field of the grid instead of searching for it.
+
+        Args:
+            node (Square): The square to reach.
+            target (Square, optional): The square whose flow field is followed, either the square to reach or one
+                of its neighbours. Defaults to the square to reach.
+            segments (int, optional): The number of points per square of the path. Defaults to 8.
+        """
+        if target is None:
+            target = node
+
+        self.cancel_path()  # The path along the field replaces any path requested earlier
+        self.set_start()
+        self.set_end(node)
+        path = self.grid.flow_field.search(self.start_node.index, target.index)
+        if path and node.index != target.index:
+            path.append(node.index)
+        if len(path) < 2:
+            return  # The square cannot be reached or has already been, so the current path is kept
+
+        self.set_intermediate_points([self.grid.node_at(index) for index in path], segments, True)
+
     def a_star(self):
-        count = 0
-        open_set = PriorityQueue()
-        open_set.put((0, count, self.start_node))
-        came_from = {}
-        g_score = {spot: float("inf") for row in self.grid.nodes for spot in row}
-        g_score[self.start_node] = 0
-        f_score = {spot: float("inf") for row in self.grid.nodes for spot in row}
-        f_score[self.start_node] = heuristic(
-            self.start_node.get_pos(),
-            self.end_node.get_pos(),
-            self.start_node.get_weight()
-        )
-        open_set_hash = {self.start_node}
-
-        while not open_set.empty():
-            current = open_set.get()[2]
-            open_set_hash.remove(current)
-
-            if current == self.end_node:
-                return reconstruct_path(came_from, self.end_node)
-
-            for neighbor in current.neighbors:
-                temp_g_score = g_score[current] + current.weight
-
-                if temp_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = temp_g_score
-                    f_score[neighbor] = temp_g_score + heuristic(neighbor.get_pos(), self.end_node.get_pos(),
-                                                                 neighbor.get_weight())
-                    if neighbor not in open_set_hash:
-                        count += 1
-                        open_set.put((f_score[neighbor], count, neighbor))
-                        open_set_hash.add(neighbor)
-
-        return []
+        # Paths between rooms are planned over the room graph, and those within a room with A*
+        path = self.grid.room_graph.search(self.start_node.index, self.end_node.index)
+        return [self.grid.node_at(index) for index in path]
 
     def within_reach(self, position):
         horizontal_distance = floor(abs(position[0] - self.rect.centerx)/self.grid.gap)
@@ -387,104 +443,33 @@ class Enemy(pygame.sprite.Sprite):
     # ####################################################################### #
 
     def cast(self):
-        ##############################
-        # INITIALIZE VARIABLES
-        ##############################
-        start = increase_degree(self.angle, self.ray_cone / 2 + 1)
-        ray_degree = start
-        end = increase_degree(self.angle, -self.ray_cone / 2)
-        previous_point = None
-        corner_list = []
-        contact_point = None
+        self.corners = cast_cone(self.grid.barriers, self.grid.gap, self.x, self.y, self.angle, self.ray_cone,
+                                 self.ray_reach)
 
-        ##############################
-        # CASTING RAYS
-        ##############################
-        while compare_degree(ray_degree, start, end):
-            ray_degree = increase_degree(ray_degree, -1)
-            tan_ray_angle = math.tan(math.radians(ray_degree))
-
-            ##############################
-            # HORIZONTAL RAYS
-            ##############################
-            ray_distance = 0
-            if ray_degree == 90 or ray_degree == 270:
-                ray_degree += 0.001
-            if ray_degree > 180:
-                up = False
-                ray_y = math.ceil(self.y / self.grid.gap) * self.grid.gap + 0.001
-                offset_y = -self.grid.gap
-            else:
-                up = True
-                ray_y = math.ceil(self.y / self.grid.gap) * self.grid.gap - self.grid.gap
-                offset_y = self.grid.gap
-            ray_x = (self.y - ray_y) / tan_ray_angle + self.x if tan_ray_angle != 0 else self.x
-            offset_x = offset_y / tan_ray_angle if tan_ray_angle != 0 else 0
-            while ray_distance < self.ray_reach and ray_distance < self.grid.size:
-                map_x = int(ray_x // self.grid.gap)
-                map_y = int(ray_y // self.grid.gap - (1 if up else 0))
-                if (
-                        0 <= map_x < self.grid.size and
-                        0 <= map_y < self.grid.size and self.grid.nodes[map_x][map_y].is_barrier()
-                ):
-                    ray_distance = self.ray_reach
-                else:
-                    ray_x = ray_x + offset_x
-                    ray_y = ray_y - offset_y
-                    ray_distance += 1
-            horizontal_x, horizontal_y = ray_x, ray_y
-            horizontal_distance = dist(self.x, self.y, horizontal_x, horizontal_y)
-
-            ##############################
-            # VERTICAL RAYS
-            ##############################
-            ray_distance = 0
-            if ray_degree == 90 or ray_degree == 270:
-                ray_degree += 0.001
-            if 90 < ray_degree < 270:
-                right = False
-                ray_x = math.ceil(self.x / self.grid.gap) * self.grid.gap - self.grid.gap
-                offset_x = -self.grid.gap
-            else:
-                right = True
-                ray_x = math.ceil(self.x / self.grid.gap) * self.grid.gap + 0.001
-                offset_x = self.grid.gap
-            ray_y = (self.x - ray_x) * tan_ray_angle + self.y if tan_ray_angle != 0 else self.y
-            offset_y = offset_x * tan_ray_angle if tan_ray_angle != 0 else 0
-            while ray_distance < self.ray_reach and ray_distance < self.grid.size:
-                map_x = int(ray_x // self.grid.gap - (0 if right else 1))
-                map_y = int(ray_y // self.grid.gap)
-                if (
-                        0 <= map_x < self.grid.size and
-                        0 <= map_y < self.grid.size and self.grid.nodes[map_x][map_y].is_barrier()
-                ):
-                    ray_distance = self.ray_reach
-                else:
-                    ray_x += offset_x
-                    ray_y -= offset_y
-                    ray_distance += 1
-            vertical_x, vertical_y = ray_x, ray_y
-            vertical_distance = dist(self.x, self.y, vertical_x, vertical_y)
-
-            ##############################
-            # COMPARING AND UPDATING CONTACT POINTS
-            ##############################
-            if vertical_distance < horizontal_distance:
-                contact_point = (vertical_x, vertical_y)
-            else:
-                contact_point = (horizontal_x, horizontal_y)
-            if not is_point_neighbour(previous_point, contact_point):
-                if previous_point is None:
-                    corner_list.append(((self.x, self.y), contact_point))
-                else:
-                    corner_list.append((previous_point, contact_point))
-            previous_point = contact_point
+    # ####################################################################### #
+    #                                 DETECTION                               #
+    # ####################################################################### #
 
-        ##############################
-        # FINALIZING CORNER LIST AND UPDATING MASK
-        ##############################
-        corner_list.append((contact_point, (self.x, self.y)))
-        self.corners = corner_list
+    def sees(self, rect: pygame.Rect) -> bool:
+        """
+        Check whether a rectangle of the map is inside the body or the vision cone of the enemy.
+
+        Args:
+            rect (pygame.Rect): The rectangle to check, in map coordinates.
+
+        Returns:
+            bool: True if the enemy sees the rectangle, False otherwise.
+        """
+        body = pygame.Rect(int(self.x) - self.size / 2, int(self.y) - self.size / 2, self.size, self.size)
+        if body.colliderect(rect):
+            return True
+        if not self.corners:
+            return False
+
+        vertices, (left, top, right, bottom) = polygon_bounds(self.corners)
+        if right < rect.left or left > rect.right or bottom < rect.top or top > rect.bottom:
+            return False
+        return polygon_hits_rect(vertices, rect.left, rect.top, rect.right, rect.bottom)
 
     # ####################################################################### #
     #                                 ROTATION                                #
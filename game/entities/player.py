@@ -2,11 +2,10 @@ import math
 from typing_extensions import deprecated
 
 import pygame
-from pygame import Mask
 
 from game.map.grid import Grid
-from game.sprites.spritesheet import SpriteSheet
-from utils.auxiliar import get_direction, increase, decrease, has_changed
+from managers.resource_manager import ResourceManager
+from utils.auxiliar import get_direction, increase, decrease, has_changed, blit_all
 from utils.constants import *
 from utils.enums import *
 from utils.paths.assets_paths import CHARACTER_ASSETS
@@ -41,7 +40,7 @@ class Player(pygame.sprite.Sprite):
         self.y = y
         self.groups = []
         self.size = NPC_SIZE * 0.5
-        self._sprite_sheet = SpriteSheet(CHARACTER_ASSETS, 10, 13, NPC_SIZE * 2.2)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(CHARACTER_ASSETS, 10, 13, NPC_SIZE * 2.2)
         self._animation_frames = 4
         self._animation_start = 35
         self._animation_idle = 2
@@ -50,6 +49,7 @@ class Player(pygame.sprite.Sprite):
         self.offset = VIEW_OFFSET * (NPC_SIZE / 20)
         self.image = pygame.Surface((NPC_SIZE, NPC_SIZE))
         self.image.fill((0, 0, 0))
+        self._flipped_image = self.image  # The current frame facing the other way, taken from the sprite sheet
         self.rect = self.image.get_rect()
         self.rect.center = (self.x, self.y)
 
@@ -92,6 +92,9 @@ class Player(pygame.sprite.Sprite):
         self._interacted_with_key = False
 
     def draw(self, **kwargs):
+        blit_all(kwargs.get('internal_surface'), self.draw_commands(**kwargs))
+
+    def draw_commands(self, **kwargs):
         surface = kwargs.pop('internal_surface', None)
         offset = kwargs.pop('offset', None)
 
@@ -104,28 +107,26 @@ class Player(pygame.sprite.Sprite):
         # Calculate sprite position
         sprite_rect = self.image.get_rect(centerx=self.rect.centerx, bottom=self.rect.bottom - 10)
 
-        # Flip the image if needed
-        flipped_image = pygame.transform.flip(self.image, self._looking_right, False)
+        # Pick the frame facing the right way
+        image = self._flipped_image if self._looking_right else self.image
 
-        # Draw the rotated sprite
-        surface.blit(flipped_image, (sprite_rect.x - offset.x, sprite_rect.y - offset.y))
+        # Blit the sprite
+        return [(image, (sprite_rect.x - offset.x, sprite_rect.y - offset.y))]
 
     def update(self, **kwargs):
         # Variable initialization
         movement_option = kwargs.pop('movement_option', None)
-        player_mask = kwargs.pop('player_mask', None)
-        enemy_mask = kwargs.pop('enemy_mask', None)
+        exposers = kwargs.pop('exposers', None)
 
-        # Check if movement option, player mask, and enemy mask are provided and of correct types
+        # Check if movement option and exposers are provided and of correct types
         if movement_option is not None and not isinstance(movement_option, Controls):
             raise TypeError("movement_option must be an instance of Controls enum")
-        if player_mask is not None and not isinstance(player_mask, Mask):
-            raise TypeError("player_mask must be an instance of Mask type")
-        if enemy_mask is not None and not isinstance(enemy_mask, Mask):
-            raise TypeError("enemy_mask must be an instance of Mask type")
+        if exposers is not None and not isinstance(exposers, list):
+            raise TypeError("exposers must be a list of enemies")
 
         # ENEMY DETECTION AND HEALTH HANDLING
-        if self._is_detected(player_mask=player_mask, enemy_mask=enemy_mask):
+        if self._is_detected(exposers=exposers):
+            # Each enemy adds itself to the exposers when notified, if it is in a position to tell the others
             self._health = decrease(self._health)
             self._recovering = False
             self._cooldown = 0
@@ -234,9 +235,11 @@ class Player(pygame.sprite.Sprite):
         if self._is_moving:
             self._current_frame += 0.5  # Increment frame counter by 0.5
             self._current_frame %= self._animation_frames  # Ensure frame counter wraps around
-            self.image = self._sprite_sheet.get_sprite_by_number(self._animation_start + int(self._current_frame))
-        elif not self._is_moving:
-            self.image = self._sprite_sheet.get_sprite_by_number(self._animation_idle)
+            frame = self._animation_start + int(self._current_frame)
+        else:
+            frame = self._animation_idle
+        self.image = self._sprite_sheet.get_sprite_by_number(frame)
+        self._flipped_image = self._sprite_sheet.get_sprite_by_number(frame, flipped=True)
 
     def add(self, *groups):
         for group in groups:
@@ -319,22 +322,17 @@ class Player(pygame.sprite.Sprite):
                 self.grid.visible_key = False
 
     @staticmethod
-    def _is_detected(player_mask: Mask, enemy_mask: Mask) -> bool:
+    def _is_detected(exposers: list) -> bool:
         """
         Check if the player is detected by an enemy.
 
         Args:
-            player_mask (Mask): The mask representing the player's position.
-            enemy_mask (Mask): The mask representing the enemy's position.
+            exposers (list): The enemies that see the player.
 
         Returns:
             bool: True if the player is detected by the enemy, False otherwise.
         """
-        return (
-                player_mask is not None and
-                enemy_mask is not None and
-                player_mask.overlap_area(enemy_mask, (0, 0)) > 0
-        )
+        return bool(exposers)
 
     # ####################################################################### #
     #                                DEPRECATED                               #
@@ -6,6 +6,7 @@ from game.entities.enemies.guard import Guard
 from game.entities.enemies.civilian import Civilian
 from game.entities.enemies.sentinel import Sentinel
 from game.entities.enemies.security import Security
+from utils.algorithms import cast_cones
 
 
 class Enemies(pygame.sprite.Group):
@@ -21,6 +22,34 @@ class Enemies(pygame.sprite.Group):
             for sprite in self.sprites():
                 sprite.notified(self._player)
 
+    def cast(self) -> None:
+        """
+        Cast the vision cones of every enemy in a single batch, as they all share the same grid.
+        """
+        enemies = self.sprites()
+        if not enemies:
+            return
+
+        grid = enemies[0].grid
+        corners = cast_cones(grid.barriers, grid.gap,
+                             [enemy.x for enemy in enemies], [enemy.y for enemy in enemies],
+                             [enemy.angle for enemy in enemies], [enemy.ray_cone for enemy in enemies],
+                             [enemy.ray_reach for enemy in enemies])
+        for enemy, enemy_corners in zip(enemies, corners):
+            enemy.corners = enemy_corners
+
+    def detect(self, player: Player) -> list[Enemy]:
+        """
+        Find the enemies that can see the player, whether they are on screen or not.
+
+        Args:
+            player: Player object to look for.
+
+        Returns:
+            List of the Enemy objects that see the player.
+        """
+        return [enemy for enemy in self.sprites() if enemy.sees(player.rect)]
+
     def remove(self, enemy: Enemy = None) -> None:
         if enemy:
             enemy.kill()
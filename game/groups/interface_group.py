@@ -1,6 +1,7 @@
 import pygame
 
 from game.entities.player import Player
+from utils.auxiliar import blit_all
 from utils.i18n import get_translation
 
 
@@ -36,8 +37,11 @@ class Interface(pygame.sprite.Group):
             sprite.notified(**kwargs)
 
     def draw(self, *args, **kwargs) -> None:
+        # The elements are blitted all at once, in the same order they would be drawn one by one
+        commands = []
         for sprite in self.sprites():
-            sprite.draw(*args, **kwargs)
+            commands.extend(sprite.draw_commands(*args, **kwargs))
+        blit_all(kwargs.get('surface'), commands)
 
     def update(self, **kwargs) -> None:
         language = kwargs.pop('language', None)
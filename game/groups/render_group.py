@@ -1,3 +1,5 @@
+import math
+from collections import OrderedDict
 from typing import List, Tuple
 
 import pygame
@@ -7,6 +9,8 @@ from typing_extensions import deprecated
 from game.entities.enemy import Enemy
 from game.entities.player import Player
 from game.map.grid import Grid
+from utils.auxiliar import blit_all
+from utils.constants import VISION_SHADOW, ZOOM_CACHE_SIZE, ZOOM_STEP
 
 
 class Camera(pygame.sprite.Group):
@@ -27,6 +31,7 @@ class Camera(pygame.sprite.Group):
         self._internal_surface = pygame.Surface(self._internal_size)
         self._internal_rectangle = self._internal_surface.get_rect(center=self.center)
         self._zoom_level = 1
+        self._zoom_surfaces = OrderedDict()  # Buffers the frame is scaled into at recent zoom steps, least recent first
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
         # Boundary-related attributes
@@ -46,7 +51,13 @@ class Camera(pygame.sprite.Group):
         self._enemy_surface = pygame.Surface((win.get_width(), win.get_height()), pygame.SRCALPHA)
         self._enemy_untreated_vertices = []
         self._enemy_untreated_positions = []
-        self._enemy_mask = pygame.mask.from_surface(self._enemy_surface)
+        self._enemy_dirty_rects = []
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+        # Vision-related attributes
+        # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        self._vision_overlay = pygame.Surface(self._enemy_surface.get_size(), pygame.SRCALPHA)
+        self._vision_overlay.fill(VISION_SHADOW)
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def _calculate_enemy_mask(self, enemy: Enemy, vertices: List[int]) -> None:
@@ -58,37 +69,32 @@ class Camera(pygame.sprite.Group):
         position_x = int(enemy.x) - self.offset[0]
         position_y = int(enemy.y) - self.offset[1]
 
-        pygame.draw.rect(
+        self._enemy_dirty_rects.append(pygame.draw.rect(
             self._enemy_surface,
             (255, 255, 255, 255),
             pygame.Rect(position_x - enemy.size / 2, position_y - enemy.size / 2, enemy.size, enemy.size)
-        )
+        ))
 
         if len(vertices) > 2:
-            pygame.draw.polygon(self._enemy_surface, (255, 255, 255), vertices)
+            self._enemy_dirty_rects.append(pygame.draw.polygon(self._enemy_surface, (255, 255, 255), vertices))
+
+    def _clear_enemy_surface(self) -> None:
+        """
+        Clears the areas of the enemy surface and the vision overlay that were drawn on the last frame.
+
+        Returns:
+            None
+        """
+        for rectangle in self._enemy_dirty_rects:
+            self._enemy_surface.fill((0, 0, 0, 0), rectangle)
+            self._vision_overlay.fill(VISION_SHADOW, rectangle)
+        self._enemy_dirty_rects = []
 
     def save_enemy_mask(self, enemy: Enemy, vertices: List[int]) -> None:
         if enemy.in_range(self._internal_surface, self._boundary.center, enemy.ray_radius):
             self._enemy_untreated_vertices.append(vertices)
             self._enemy_untreated_positions.append(enemy)
 
-    def return_enemy_mask(self) -> Surface:
-        return self._enemy_mask
-
-    def _calculate_player_mask(self, player: Player) -> pygame.mask.Mask:
-        mask_surface = pygame.Surface((self.surface.get_width(), self.surface.get_height()), pygame.SRCALPHA)
-        player_rect = (
-            player.rect.x - self.offset[0],
-            player.rect.y - self.offset[1],
-            player.rect.width,
-            player.rect.height
-        )
-        pygame.draw.rect(mask_surface, (255, 255, 255, 255), player_rect)
-        return pygame.mask.from_surface(mask_surface)
-
-    def return_player_mask(self, player: Player) -> pygame.mask.Mask:
-        return self._calculate_player_mask(player)
-
     def draw(self, *args, **kwargs):
         player = kwargs.get('player')
         if player is not None and not isinstance(player, Player):
@@ -115,15 +121,15 @@ class Camera(pygame.sprite.Group):
         kwargs['float'] = False
         kwargs['floor'] = True
 
-        # Draw the grid
+        # Draw the grid, advancing its animations once per frame
         if grid:
+            grid.clock.tick()
             grid.draw(**kwargs)
         else:
             print('No Grid has reached the camera.')
 
-        # Prepare enemy surface
-        win = pygame.display.get_surface()
-        self._enemy_surface = pygame.Surface((win.get_width(), win.get_height()), pygame.SRCALPHA)
+        # Clear what was drawn on the enemy surface on the last frame
+        self._clear_enemy_surface()
 
         # Calculate enemy masks
         for vertices, enemy in zip(self._enemy_untreated_vertices, self._enemy_untreated_positions):
@@ -133,24 +139,20 @@ class Camera(pygame.sprite.Group):
         self._enemy_untreated_vertices = []
         self._enemy_untreated_positions = []
 
-        # Create enemy mask
-        self._enemy_mask = pygame.mask.from_surface(self._enemy_surface)
-
         # Draw player rectangle
         if player:
             position_x = int(player.x) - self.offset[0]
             position_y = int(player.y) - self.offset[1]
-            pygame.draw.rect(
+            self._enemy_dirty_rects.append(pygame.draw.rect(
                 self._enemy_surface,
                 (255, 255, 255, 255),
                 pygame.Rect(position_x, position_y, player.size * 2, player.size * 2)
-            )
+            ))
 
-        # Blend enemy mask with internal surface
-        if self._enemy_mask is not None:
-            self._internal_surface.blit(
-                pygame.mask.from_surface(
-                    self._enemy_surface).to_surface(setcolor=None, unsetcolor=(0, 0, 0, 100)), (0, 0))
+        # Uncover whatever was drawn on the enemy surface and blend the overlay with the internal surface
+        for rectangle in self._enemy_dirty_rects:
+            self._vision_overlay.blit(self._enemy_surface, rectangle, rectangle, special_flags=pygame.BLEND_RGBA_SUB)
+        self._internal_surface.blit(self._vision_overlay, (0, 0))
 
         # Draw the grid again (if needed)
         kwargs['float'] = False
@@ -158,9 +160,16 @@ class Camera(pygame.sprite.Group):
         if grid:
             grid.draw(**kwargs)
 
-        # Draw sprites
-        for sprite in sorted(self.sprites(), key=lambda custom_sprite: 0 - custom_sprite.rect.width):
-            sprite.draw(*args, **kwargs)
+        # Draw sprites, skipping those far from the squares in view
+        sprites = self.sprites()
+        if grid:
+            region = grid.visible_region(self.offset, self._internal_surface.get_size(), padding=grid.gap * 2)
+            sprites = [sprite for sprite in sprites
+                       if region.collidepoint(int(sprite.x // grid.gap), int(sprite.y // grid.gap))]
+        commands = []
+        for sprite in sorted(sprites, key=lambda custom_sprite: 0 - custom_sprite.rect.width):
+            commands.extend(sprite.draw_commands(*args, **kwargs))
+        blit_all(self._internal_surface, commands)
 
         # Draw floating grid elements
         kwargs['float'] = True
@@ -168,10 +177,54 @@ class Camera(pygame.sprite.Group):
         if grid:
             grid.draw(**kwargs)
 
-        # Scale and blit the internal surface to the main surface
-        scaled_surface = pygame.transform.scale(self._internal_surface, self._internal_size * self._zoom_level)
-        scaled_rectangle = scaled_surface.get_rect(center=self.center)
-        self.surface.blit(scaled_surface, scaled_rectangle)
+        # Blit the internal surface to the main surface, scaled to the zoom level
+        self._present()
+
+    def _present(self) -> None:
+        """
+        Blits the internal surface to the main surface at the current zoom level.
+
+        Only the default zoom avoids rescaling: the internal surface is blitted as it is. At any other zoom level the
+        visible part of the internal surface is still scaled on every frame, after rounding the zoom level to a zoom
+        step; only the buffer it is scaled into is reused while the zoom step does not change.
+
+        Returns:
+            None
+        """
+        if self._zoom_level == 1:
+            self.surface.blit(self._internal_surface, self._internal_rectangle)
+            return
+
+        zoom = max(ZOOM_STEP, round(self._zoom_level / ZOOM_STEP) * ZOOM_STEP)
+        source = self._internal_surface.get_rect()
+        if zoom > 1:
+            # Zooming in crops the sides of the frame, so they are never scaled
+            source.size = (math.ceil(source.width / zoom), math.ceil(source.height / zoom))
+            source.center = self._internal_surface.get_rect().center
+
+        target = self._zoom_surface((round(source.width * zoom), round(source.height * zoom)))
+        pygame.transform.scale(self._internal_surface.subsurface(source), target.get_size(), target)
+        self.surface.blit(target, target.get_rect(center=self.center))
+
+    def _zoom_surface(self, size: Tuple[int, int]) -> Surface:
+        """
+        Gets the buffer a zoom step is scaled into, evicting the least recently used one when there are too many.
+
+        The buffer only saves allocating a new surface; its content is drawn again on every frame.
+
+        Args:
+            size: The size of the scaled frame.
+
+        Returns:
+            Surface: A surface of the given size.
+        """
+        surface = self._zoom_surfaces.pop(size, None)
+        if surface is None:
+            surface = pygame.Surface(size, 0, self._internal_surface)
+            if len(self._zoom_surfaces) >= ZOOM_CACHE_SIZE:
+                self._zoom_surfaces.popitem(last=False)
+        self._zoom_surfaces[size] = surface
+        return surface
 
     def _zoom(self) -> None:
         """
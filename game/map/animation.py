@@ -0,0 +1,77 @@
+from utils.constants import TILE_SCREEN
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                    ANIMATION CLOCK CLASS                                      #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class AnimationClock:
+    """
+    The animation state shared by every square of a grid, advanced once per frame.
+
+    All the animated tiles of the grid show the same frame, so drawing them does not change any state and the
+    baked chunks of the static layers are never touched.
+
+    Attributes:
+        ticks (int): The number of frames the clock has advanced.
+        key_offset (float): The vertical offset of the floating key, in pixels.
+    """
+
+    # Tile animation attributes
+    _delay_frame = 2
+    _total_frames = 3
+
+    # Key animation attributes
+    _key_limit = 1.5
+    _key_steps = 2  # The key is drawn on two passes of every frame and used to move on each of them
+
+    def __init__(self):
+        """
+        Initialize an AnimationClock object.
+        """
+        self.ticks = 0
+        self._current_frame = 0
+        self._pass_frame = self._delay_frame
+
+        self.key_offset = 0
+        self._key_speed = 0.25
+
+    def tick(self) -> None:
+        """
+        Advance every animation of the grid by one frame.
+        """
+        self.ticks += 1
+
+        self._current_frame += 1
+        if self._current_frame >= self._total_frames:
+            self._current_frame = 0
+
+        if self._pass_frame == 0:
+            self._current_frame += 1
+            self._pass_frame = self._delay_frame
+        else:
+            self._pass_frame -= 1
+
+        for _ in range(self._key_steps):
+            self.key_offset += self._key_speed
+            if abs(self.key_offset) >= self._key_limit:
+                self._key_speed *= -1
+                self.key_offset += self._key_speed
+
+    def animate(self, tile_id: int) -> int:
+        """
+        Get the tile shown on the current frame in place of the first frame of an animated tile.
+
+        Args:
+            tile_id (int): The ID of the first frame of the animated tile.
+
+        Returns:
+            int: The ID of the tile to draw.
+        """
+        distance = 2 if tile_id in TILE_SCREEN else 1
+
+        jump = distance * self._current_frame
+        if self._current_frame > 0:
+            jump += 1
+
+        return tile_id + jump
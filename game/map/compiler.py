@@ -0,0 +1,373 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import struct
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.constants import ANIMATED_TILES, FLOATING_TILES, GROUND_TILES, MAP_SIZE, WEIGHT
+from utils.paths.maps_paths import COMPILED_FOLDER_PATH, LEVELS
+
+# Order in which the neighbours of a square are listed: cardinal directions first, then diagonals
+NEIGHBOUR_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, -1), (1, 1), (-1, 1))
+NEIGHBOUR_BITS = (1 << np.arange(len(NEIGHBOUR_STEPS))).astype(np.uint8)
+
+MAGIC = b'CIIELVL\x00'  # Represents the signature at the start of every compiled level file.
+FORMAT_VERSION = 1  # Represents the version of the compiled level layout, part of the source hash.
+ALIGNMENT = 64  # Represents the byte alignment of every array stored in a compiled level file.
+
+TILE_FLOOR = 1  # Represents the flag of the tiles drawn below everything else.
+TILE_OBJECT = 2  # Represents the flag of the tiles drawn between the floor and the entities.
+TILE_FLOATING = 4  # Represents the flag of the tiles drawn over the entities.
+TILE_ANIMATED = 8  # Represents the flag of the object tiles that cycle through several frames.
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                         MAP PARSING                                           #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+def parse_border_map(file_path: str, size: int) -> tuple:
+    """
+    Read a border map file, where every character is either the zone ID of a room or a barrier.
+
+    Args:
+        file_path (str): The path of the border map file.
+        size (int): The number of squares per side of the grid.
+
+    Returns:
+        tuple: The barrier flags and the zone IDs of the squares, indexed by row and column.
+    """
+    with open(file_path, 'r') as file:
+        csv_file = csv.reader(file)
+        lines = []
+        for line in csv_file:
+            # Split the line into characters
+            characters = list(line[0].strip())
+            # Append the characters to the lines list
+            lines.append(characters)
+
+    # The file is stored column by column
+    cells = np.array(lines)[:size, :size].T
+    rooms = np.char.isnumeric(cells)
+
+    zones = np.full((size, size), -1, dtype=np.int8)
+    zones[rooms] = cells[rooms].astype(np.int8)
+    return ~rooms, zones
+
+
+def parse_tile_map(file_path: str, size: int) -> np.ndarray:
+    """
+    Read a tile map file with one tile ID per square.
+
+    Args:
+        file_path (str): The path of the tile map file.
+        size (int): The number of squares per side of the grid.
+
+    Returns:
+        np.ndarray: The tile IDs of the squares, indexed by row and column.
+    """
+    # The file is stored column by column
+    return np.loadtxt(file_path, delimiter=',', dtype=np.int16, ndmin=2)[:size, :size].T
+
+
+def build_adjacency(barriers: np.ndarray) -> np.ndarray:
+    """
+    Compute the accessible neighbours of every square, in the order of NEIGHBOUR_STEPS.
+
+    A diagonal neighbour is only accessible if neither of the two squares beside it is a barrier.
+
+    Args:
+        barriers (np.ndarray): The barrier flags of the squares.
+
+    Returns:
+        np.ndarray: The flat index of each neighbour of every square, or -1 if it is not accessible.
+    """
+    size = barriers.shape[0]
+    # Out-of-bounds cells are treated as barriers, so they are never neighbours
+    blocked = np.ones((size + 2, size + 2), dtype=bool)
+    blocked[1:-1, 1:-1] = barriers
+    indices = np.arange(size * size, dtype=np.int32).reshape(size, size)
+
+    def shifted(row_step, col_step):
+        return blocked[1 + row_step:size + 1 + row_step, 1 + col_step:size + 1 + col_step]
+
+    adjacency = np.empty((size * size, len(NEIGHBOUR_STEPS)), dtype=np.int32)
+    for k, (row_step, col_step) in enumerate(NEIGHBOUR_STEPS):
+        accessible = ~shifted(row_step, col_step)
+        if row_step != 0 and col_step != 0:
+            accessible &= ~shifted(row_step, 0) & ~shifted(0, col_step)
+        adjacency[:, k] = np.where(accessible, indices + row_step * size + col_step, -1).ravel()
+
+    return adjacency
+
+
+def build_weights(barriers: np.ndarray) -> np.ndarray:
+    """
+    Compute the pathfinding weight of every square, which grows with each barrier on its sides.
+
+    Args:
+        barriers (np.ndarray): The barrier flags of the squares.
+
+    Returns:
+        np.ndarray: The weight of every square.
+    """
+    size = barriers.shape[0]
+    walls = np.zeros((size + 2, size + 2), dtype=np.int32)
+    walls[1:-1, 1:-1] = barriers
+    return WEIGHT * (walls[2:, 1:-1] + walls[:-2, 1:-1] + walls[1:-1, 2:] + walls[1:-1, :-2])
+
+
+def pack_adjacency(adjacency: np.ndarray) -> np.ndarray:
+    """
+    Pack the neighbours of every square into a bitmask with one bit per direction of NEIGHBOUR_STEPS.
+
+    Args:
+        adjacency (np.ndarray): The neighbour table, as returned by build_adjacency.
+
+    Returns:
+        np.ndarray: The neighbour bitmask of every square.
+    """
+    return np.bitwise_or.reduce(np.where(adjacency >= 0, NEIGHBOUR_BITS, 0).astype(np.uint8), axis=1)
+
+
+def unpack_adjacency(neighbour_mask: np.ndarray) -> np.ndarray:
+    """
+    Expand a neighbour bitmask back into the neighbour table.
+
+    Args:
+        neighbour_mask (np.ndarray): The neighbour bitmask of every square, as returned by pack_adjacency.
+
+    Returns:
+        np.ndarray: The flat index of each neighbour of every square, or -1 if it is not accessible.
+    """
+    size = int(round(np.sqrt(neighbour_mask.size)))
+    steps = np.array([row_step * size + col_step for row_step, col_step in NEIGHBOUR_STEPS], dtype=np.int32)
+    indices = np.arange(size * size, dtype=np.int32)[:, np.newaxis]
+    return np.where(neighbour_mask[:, np.newaxis] & NEIGHBOUR_BITS, indices + steps, -1).astype(np.int32)
+
+
+def classify_tiles(tiles: np.ndarray) -> np.ndarray:
+    """
+    Sort every tile of the tile map layers into the layers it is drawn on.
+
+    A tile can be both a floor and a floating tile, while object tiles are the remaining non-empty ones.
+
+    Args:
+        tiles (np.ndarray): The tile IDs of the squares, one array per tile map layer.
+
+    Returns:
+        np.ndarray: The layer flags of every tile, with the same shape as the tile IDs.
+    """
+    floor = np.isin(tiles, GROUND_TILES)
+    floating = np.isin(tiles, FLOATING_TILES) & (tiles >= 0)
+    objects = (tiles >= 0) & ~floor & ~floating
+    animated = objects & np.isin(tiles, ANIMATED_TILES)
+
+    flags = np.zeros(tiles.shape, dtype=np.uint8)
+    flags[floor] |= TILE_FLOOR
+    flags[objects] |= TILE_OBJECT
+    flags[floating] |= TILE_FLOATING
+    flags[animated] |= TILE_ANIMATED
+    return flags
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                       COMPILED LEVEL                                          #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class CompiledLevel:
+    """
+    The data of a level loaded from its compiled file.
+
+    Attributes:
+        data (dict): The level description, as found in the level JSON file.
+        size (int): The number of squares per side of the grid.
+        barriers (np.ndarray): The barrier flags of the squares.
+        zones (np.ndarray): The zone IDs of the squares.
+        weights (np.ndarray): The pathfinding weights of the squares.
+        tiles (np.ndarray): The tile IDs of the squares, one layer per tile map.
+        adjacency (np.ndarray): The flat index of each neighbour of every square, or -1.
+    """
+
+    def __init__(self, data: dict, size: int, arrays: Dict[str, np.ndarray]):
+        self.data = data
+        self.size = size
+        self.barriers = np.unpackbits(arrays['barriers'], count=size * size).astype(bool).reshape(size, size)
+        self.zones = arrays['zones']
+        self.weights = arrays['weights']
+        self.tiles = arrays['tiles']
+        self.adjacency = unpack_adjacency(arrays['neighbours'])
+
+
+def compiled_path(level_path: str) -> str:
+    """
+    Get the path of the compiled file of a level.
+
+    Args:
+        level_path (str): The path of the level JSON file.
+
+    Returns:
+        str: The path of the compiled level file.
+    """
+    name, _ = os.path.splitext(os.path.basename(level_path))
+    return os.path.join(COMPILED_FOLDER_PATH, name + '.lvl')
+
+
+def _map_paths(data: dict) -> List[str]:
+    level_map = data['level_map']
+    paths = [level_map['border_map_path'], level_map['tile_map_path']]
+    if level_map.get('objects_map_path') is not None:
+        paths.append(level_map['objects_map_path'])
+    return paths
+
+
+def source_hash(level_path: str, size: int = MAP_SIZE) -> str:
+    """
+    Compute the hash of the sources of a level: its JSON file and every map file it references.
+
+    Args:
+        level_path (str): The path of the level JSON file.
+        size (int, optional): The number of squares per side of the grid. Defaults to MAP_SIZE.
+
+    Returns:
+        str: The hexadecimal digest of the sources.
+    """
+    digest = hashlib.sha256(struct.pack('<II', FORMAT_VERSION, size))
+    with open(level_path, 'rb') as file:
+        contents = file.read()
+    digest.update(contents)
+
+    for path in _map_paths(json.loads(contents)):
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+
+def compile_level(level_path: str, size: int = MAP_SIZE) -> str:
+    """
+    Compile a level JSON file and its maps into a single binary file.
+
+    The file starts with MAGIC and the length of a JSON header, which holds the level description, the source
+    hash and the dtype, shape and offset of each array. The raw arrays follow, aligned to ALIGNMENT bytes.
+
+    Args:
+        level_path (str): The path of the level JSON file.
+        size (int, optional): The number of squares per side of the grid. Defaults to MAP_SIZE.
+
+    Returns:
+        str: The path of the compiled level file.
+    """
+    with open(level_path, 'r') as file:
+        data = json.load(file)
+
+    paths = _map_paths(data)
+    barriers, zones = parse_border_map(paths[0], size)
+    # The squares in the border of the grid are always barriers
+    barriers[[0, -1], :] = True
+    barriers[:, [0, -1]] = True
+
+    arrays = {
+        'tiles': np.stack([parse_tile_map(path, size) for path in paths[1:]]),
+        'zones': zones,
+        'weights': build_weights(barriers),
+        'barriers': np.packbits(barriers),
+        'neighbours': pack_adjacency(build_adjacency(barriers))
+    }
+
+    # The header is written last, once the offsets of the arrays are known
+    descriptors = {}
+    offset = 0
+    for name, array in arrays.items():
+        descriptors[name] = {'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({
+        'hash': source_hash(level_path, size),
+        'size': size,
+        'level': data,
+        'arrays': descriptors
+    }).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 4 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    output_path = compiled_path(level_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Written to a temporary file first so a running game never reads a half-written level
+    temporary_path = output_path + '.%d.tmp' % os.getpid()
+    with open(temporary_path, 'wb') as file:
+        file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for name, array in arrays.items():
+            file.seek(data_start + descriptors[name]['offset'])
+            file.write(np.ascontiguousarray(array).tobytes())
+    os.replace(temporary_path, output_path)
+
+    return output_path
+
+
+def _read_header(file_path: str) -> Optional[dict]:
+    try:
+        with open(file_path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                return None
+            header_size, = struct.unpack('<I', file.read(4))
+            header = json.loads(file.read(header_size).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+
+    header['data_start'] = -(-(len(MAGIC) + 4 + header_size) // ALIGNMENT) * ALIGNMENT
+    return header
+
+
+def load_level(level_path: str, size: int = MAP_SIZE) -> CompiledLevel:
+    """
+    Load the compiled file of a level, compiling it first if it is missing or its sources have changed.
+
+    The arrays are memory-mapped copy-on-write, so the grid can modify them without touching the file.
+
+    Args:
+        level_path (str): The path of the level JSON file.
+        size (int, optional): The number of squares per side of the grid. Defaults to MAP_SIZE.
+
+    Returns:
+        CompiledLevel: The data of the level.
+    """
+    file_path = compiled_path(level_path)
+    expected_hash = source_hash(level_path, size)
+
+    header = _read_header(file_path)
+    if header is None or header['hash'] != expected_hash:
+        compile_level(level_path, size)
+        header = _read_header(file_path)
+
+    arrays = {
+        name: np.memmap(file_path, dtype=np.dtype(descriptor['dtype']), mode='c',
+                        offset=header['data_start'] + descriptor['offset'], shape=tuple(descriptor['shape']))
+        for name, descriptor in header['arrays'].items()
+    }
+    return CompiledLevel(header['level'], header['size'], arrays)
+
+
+# ####################################################################### #
+#                                    CLI                                  #
+# ####################################################################### #
+
+def main(arguments: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description='Compile the levels of the game into binary files.')
+    parser.add_argument('levels', nargs='*', type=int, help='numbers of the levels to compile (all by default)')
+    parser.add_argument('--force', action='store_true', help='compile even if the sources have not changed')
+    parsed = parser.parse_args(arguments)
+
+    for level_number in parsed.levels or sorted(LEVELS.keys()):
+        level_path = LEVELS[level_number]
+        header = _read_header(compiled_path(level_path))
+        if not parsed.force and header is not None and header['hash'] == source_hash(level_path):
+            print('Level', level_number, 'is up to date.')
+            continue
+        print('Level', level_number, 'compiled into', compile_level(level_path))
+
+
+if __name__ == '__main__':
+    main()
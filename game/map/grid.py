@@ -1,13 +1,19 @@
-import csv
 import random
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
+import numpy as np
 import pygame
 from pygame import Surface
 
+from game.map.animation import AnimationClock
+from game.map.compiler import (NEIGHBOUR_STEPS, TILE_ANIMATED, TILE_FLOATING, TILE_FLOOR, TILE_OBJECT,
+                               build_adjacency, build_weights, classify_tiles, parse_border_map, parse_tile_map)
+from game.map.layer import TileLayer
 from game.map.square import Square
-from game.sprites.spritesheet import SpriteSheet
-from utils.constants import GRID_BACKGROUND, MAP, TILE_MAP, SQUARE_SIZE
+from managers.resource_manager import ResourceManager
+from utils.algorithms import FlowField, PathCache, PathFinder, PathScheduler, RoomGraph
+from utils.auxiliar import blit_all
+from utils.constants import GRID_BACKGROUND, MAP, PATH_WORKERS, TILE_MAP, SQUARE_SIZE
 from utils.paths.assets_paths import UI_ICONS
 
 
@@ -17,7 +23,8 @@ from utils.paths.assets_paths import UI_ICONS
 
 class Grid:
     def __init__(self, size, win, border_map_path=None, tile_map_path=None, objects_map_path=None,
-                 sprite_sheet_path=None, ss_columns=37, ss_rows=23):
+                 sprite_sheet_path=None, ss_columns=37, ss_rows=23, compiled_level=None,
+                 path_workers=PATH_WORKERS, room_graph=None, bake=True):
         """
         Initialize a Grid object.
 
@@ -30,6 +37,13 @@ class Grid:
             sprite_sheet_path (str, optional): Path to the sprite sheet file. Defaults to None.
             ss_columns (int, optional): Number of columns in the sprite sheet. Defaults to 37.
             ss_rows (int, optional): Number of rows in the sprite sheet. Defaults to 23.
+            compiled_level (CompiledLevel, optional): Compiled data of the level, used instead of reading the map
+                files. Defaults to None.
+            path_workers (int, optional): Number of background processes searching the paths of the enemies, or 0
+                to search them on the main loop. Defaults to PATH_WORKERS.
+            room_graph (RoomGraph, optional): Rooms already extracted from the compiled level, adopted instead of
+                extracting them again. Defaults to None.
+            bake (bool, optional): Whether to render the layers now, or leave it to bake_steps(). Defaults to True.
         """
         self.groups = []
 
@@ -41,6 +55,22 @@ class Grid:
         self.nodes = []
         self.hover = None
 
+        # ──────── CELL ARRAYS ──────── #
+        self.barriers = np.zeros((size, size), dtype=bool)
+        self.zones = np.full((size, size), -1, dtype=np.int8)
+        self.weights = np.zeros((size, size), dtype=np.int32)
+        self.exits = np.zeros((size, size), dtype=bool)
+        self.tiles = np.empty((0, size, size), dtype=np.int16)
+        self.tile_flags = np.empty((0, size, size), dtype=np.uint8)  # Layers each tile is drawn on
+        self.animated = np.zeros((size, size), dtype=bool)  # Squares with an animated object tile
+        self.adjacency = np.full((size * size, len(NEIGHBOUR_STEPS)), -1, dtype=np.int32)
+        self.version = 0  # Increased every time the barriers, neighbours or weights change
+
+        # ──────── WALKABLE NODE INDEX ──────── #
+        self.walkable_nodes = np.empty(0, dtype=np.intp)
+        self.zone_nodes: Dict[int, np.ndarray] = {}
+        self._zones_cache: Dict[tuple, np.ndarray] = {}
+
         self._create_array()
 
         # ──────── SPAWN POINT ──────── #
@@ -48,38 +78,121 @@ class Grid:
 
         # ──────── KEY VISIBILITY ──────── #
         self.visible_key = True
+        self.key_node = None
 
         # ──────── READ MAPS ──────── #
-        self.read_border_map(MAP if border_map_path is None else border_map_path)
-        self.read_tile_map(TILE_MAP if tile_map_path is None else tile_map_path)
-        self.read_tile_map(objects_map_path) if objects_map_path is not None else None
+        if compiled_level is None:
+            self.read_border_map(MAP if border_map_path is None else border_map_path)
+            self.read_tile_map(TILE_MAP if tile_map_path is None else tile_map_path)
+            self.read_tile_map(objects_map_path) if objects_map_path is not None else None
+        else:
+            self.load_compiled_level(compiled_level)
 
         # ──────── SPRITE SHEET ──────── #
-        self.sprite_sheet = SpriteSheet(sprite_sheet_path, ss_columns, ss_rows, SQUARE_SIZE) if tile_map_path is not None else None
-        self.key_sheet = SpriteSheet(UI_ICONS, 10, 9, SQUARE_SIZE)
+        self.sprite_sheet = ResourceManager.load_sprite_sheet(sprite_sheet_path, ss_columns, ss_rows, SQUARE_SIZE) if tile_map_path is not None else None
+        self.key_sheet = ResourceManager.load_sprite_sheet(UI_ICONS, 10, 9, SQUARE_SIZE)
 
         # ──────── UPDATE ──────── #
-        self._update_array()
+        self._update_array() if compiled_level is None else None
+        self.path_finder = PathFinder(self)
+        self.flow_field = FlowField(self)  # Shared by every enemy chasing the same square
+        if room_graph is None:
+            self.room_graph = RoomGraph(self)
+            self.room_graph.refresh()
+        else:
+            self.room_graph = room_graph
+            self.room_graph.attach(self)
+        self.path_scheduler = PathScheduler(self, workers=path_workers)  # Answers the path requests of the enemies
+        self.path_cache = PathCache(self)  # Keeps the smoothed paths of the enemies until the grid changes
+
+        # ──────── BAKED LAYERS ──────── #
+        self.floor_layer = TileLayer(self, TILE_FLOOR, opaque=True)
+        self.objects_layer = TileLayer(self, TILE_OBJECT, static=True)
+        self.floating_layer = TileLayer(self, TILE_FLOATING)
+        self.animated_nodes = []
+        self.animated_cells: Dict[int, tuple] = {}
+        self.clock = AnimationClock()
+        self._bake() if bake else None
 
     # ####################################################################### #
     #                                  TRIVIAL                                #
     # ####################################################################### #
 
     def _create_array(self):
-        self.nodes = []
-        for i in range(self.size):
-            self.nodes.append([])
-            for j in range(self.size):
-                node = Square(i, j, self.gap, self.size, self.size, 0)
-                if node.is_border():
-                    node.make_barrier()
-                self.nodes[i].append(node)
+        self.nodes = [[Square(self, i, j) for j in range(self.size)] for i in range(self.size)]
+        self._set_border_barriers()
+
+    def _set_border_barriers(self):
+        self.barriers[[0, -1], :] = True
+        self.barriers[:, [0, -1]] = True
 
     def _update_array(self):
-        for row in self.nodes:
-            for spot in row:
-                spot.update_neighbors(self)
-                spot.surrounding_barrier(self)
+        """
+        Recompute the neighbours and weights of every square from the barrier array.
+        """
+        self._set_border_barriers()
+        self.adjacency = build_adjacency(self.barriers)
+        self.weights = build_weights(self.barriers)
+        self._update_index()
+
+    def _update_index(self):
+        """
+        Rebuild the flat indices of the walkable nodes, overall and per zone, keeping them in row-major order.
+        """
+        self.walkable_nodes = np.flatnonzero(~self.barriers)
+        zones = self.zones.ravel()[self.walkable_nodes]
+        in_zone = zones >= 0
+
+        nodes = self.walkable_nodes[in_zone]
+        zones = zones[in_zone]
+        # A stable sort keeps the nodes of each zone in row-major order
+        order = np.argsort(zones, kind='stable')
+        zone_ids, starts = np.unique(zones[order], return_index=True)
+        self.zone_nodes = dict(zip(zone_ids.tolist(), np.split(nodes[order], starts[1:])))
+        self._zones_cache = {}
+
+        self.version += 1
+
+    def _classify_tiles(self):
+        """
+        Sort every tile of the grid into the layers it is drawn on, so drawing never checks the tile lists.
+        """
+        self.tile_flags = classify_tiles(self.tiles)
+        self.animated = (self.tile_flags & TILE_ANIMATED).any(axis=0)
+
+    def _index_animated_cell(self, row: int, col: int) -> None:
+        """
+        Store the object tiles of an animated square and the position of the tile that cycles through frames.
+        """
+        index = row * self.size + col
+        if not self.animated[row, col]:
+            self.animated_cells.pop(index, None)
+            return
+
+        tiles = self.tiles[:, row, col].tolist()
+        flags = self.tile_flags[:, row, col].tolist()
+        object_tiles = [(tile_id, tile_flags) for tile_id, tile_flags in zip(tiles, flags) if tile_flags & TILE_OBJECT]
+        animated_slot = next(slot for slot, (_, tile_flags) in enumerate(object_tiles) if tile_flags & TILE_ANIMATED)
+        self.animated_cells[index] = ([tile_id for tile_id, _ in object_tiles], animated_slot)
+
+    def _bake(self):
+        for _ in self.bake_steps():
+            pass
+
+    def bake_steps(self) -> Iterator[None]:
+        """
+        Index the animated squares and render the layers of the grid, yielding after each chunk.
+
+        Yields:
+            None: After each rendered chunk.
+        """
+        self.animated_nodes = [self.node_at(index) for index in np.flatnonzero(self.animated)]
+        self.animated_cells = {}
+        for node in self.animated_nodes:
+            self._index_animated_cell(node.row, node.col)
+        yield from self.floor_layer.bake_steps()
+        yield from self.objects_layer.bake_steps()
+        yield from self.floating_layer.bake_steps()
 
     def draw(self, **kwargs):
         surface = kwargs.pop('internal_surface', None)
@@ -104,25 +217,72 @@ class Grid:
         if not isinstance(only_floor, bool):
             raise TypeError("floor must be an instance of Boolean class")
 
+        # Everything drawn on the layer is collected and blitted at once
         if only_floor:
             surface.fill(GRID_BACKGROUND)
+            commands = self.floor_layer.draw_commands(surface, offset)
+        elif only_float:
+            commands = self.floating_layer.draw_commands(surface, offset)
+        else:
+            commands = self.objects_layer.draw_commands(surface, offset)
+            # Animated squares are drawn one by one, so only those around the view are visited
+            region = self.visible_region(offset, surface.get_size(), padding=self.gap)
+            rows, cols = np.nonzero(self.animated[region.left:region.right, region.top:region.bottom])
+            for row, col in zip((rows + region.left).tolist(), (cols + region.top).tolist()):
+                commands.extend(self.nodes[row][col].draw_commands(win=surface, sprite_sheet=self.sprite_sheet,
+                                                                   offset=offset))
 
-        for row in self.nodes:
-            for spot in row:
-                if spot.is_key and self.visible_key:
-                    key = self.key_sheet
-                else:
-                    key = None
-                spot.draw(
-                    win=surface,
-                    sprite_sheet=self.sprite_sheet,
-                    offset=offset,
-                    only_float=only_float,
-                    only_floor=only_floor,
-                    key_sheet=key
-                )
-                if spot.is_border():
-                    spot.make_barrier()
+        if self.key_node is not None and self.visible_key and not only_float:
+            commands.extend(self.key_node.key_commands(surface, self.key_sheet, offset))
+
+        blit_all(surface, commands)
+
+    def visible_region(self, offset: pygame.math.Vector2, size: tuple, padding: int = 0) -> pygame.Rect:
+        """
+        Get the squares of the grid shown by a view of the map.
+
+        Args:
+            offset (pygame.math.Vector2): The position of the top-left corner of the view on the map.
+            size (tuple): The width and height of the view in pixels.
+            padding (int, optional): The pixels added around the view. Defaults to 0.
+
+        Returns:
+            pygame.Rect: The rows (horizontal axis) and columns (vertical axis) of the squares that overlap the view,
+                clipped to the grid.
+        """
+        first_row = int((offset.x - padding) // self.gap)
+        first_col = int((offset.y - padding) // self.gap)
+        last_row = int((offset.x + size[0] + padding) // self.gap)
+        last_col = int((offset.y + size[1] + padding) // self.gap)
+        region = pygame.Rect(first_row, first_col, last_row - first_row + 1, last_col - first_col + 1)
+        return region.clip(0, 0, self.size, self.size)
+
+    def layer_tiles(self, row: int, col: int, layer: int) -> List[int]:
+        """
+        Get the tiles of the square at the specified coordinates that are drawn on a layer.
+
+        Args:
+            row (int): The row index of the square.
+            col (int): The column index of the square.
+            layer (int): The flag of the layer, such as TILE_FLOOR.
+
+        Returns:
+            List[int]: The tile IDs of the square on the layer, in tile map order.
+        """
+        return self.tiles[:, row, col][(self.tile_flags[:, row, col] & layer) != 0].tolist()
+
+    def node_at(self, index: int) -> Square:
+        """
+        Get the node at the specified flat index of the grid arrays.
+
+        Args:
+            index (int): The flat index of the node.
+
+        Returns:
+            Square: The node at the specified index.
+        """
+        row, col = divmod(int(index), self.size)
+        return self.nodes[row][col]
 
     def add(self, group):
         for row in self.nodes:
@@ -140,23 +300,7 @@ class Grid:
         Args:
             full_file_path (str): The full file path of the border map file.
         """
-        with open(full_file_path, 'r') as file:
-            csv_file = csv.reader(file)
-            lines = []
-            for line in csv_file:
-                # Split the line into characters
-                characters = list(line[0].strip())
-                # Append the characters to the lines list
-                lines.append(characters)
-
-            for y, row in enumerate(self.nodes):
-                for x, node in enumerate(row):
-                    if lines[x][y] == 'X':
-                        node.make_barrier()
-                    elif lines[x][y].isnumeric():
-                        node.make_room(int(lines[x][y]))
-                    else:
-                        node.make_barrier()
+        self.barriers, self.zones = parse_border_map(full_file_path, self.size)
 
         # print("Map imported successfully.")
 
@@ -167,18 +311,30 @@ class Grid:
         Args:
             file_path (str): The full file path of the tile map file.
         """
-        tile_map = []
-        with open(file_path, mode='r') as file:
-            csv_file = csv.reader(file)
-            for line in csv_file:
-                tile_map.append(line)
-
-        for y, row in enumerate(self.nodes):
-            for x, square in enumerate(row):
-                square.set_tile_id(int(tile_map[x][y]))
+        tile_map = parse_tile_map(file_path, self.size)
+        self.tiles = np.concatenate((self.tiles, tile_map[np.newaxis]))
+        self._classify_tiles()
 
         # print("Tile map imported successfully.")
 
+    def load_compiled_level(self, compiled_level) -> None:
+        """
+        Take the squares of the grid from a compiled level, including their precomputed neighbours and weights.
+
+        Args:
+            compiled_level (CompiledLevel): The compiled data of the level.
+        """
+        if compiled_level.size != self.size:
+            raise ValueError("compiled level has size %d, expected %d" % (compiled_level.size, self.size))
+
+        self.barriers = compiled_level.barriers
+        self.zones = compiled_level.zones
+        self.weights = compiled_level.weights
+        self.tiles = compiled_level.tiles
+        self.adjacency = compiled_level.adjacency
+        self._classify_tiles()
+        self._update_index()
+
     # ####################################################################### #
     #                                COLLISIONS                               #
     # ####################################################################### #
@@ -252,7 +408,7 @@ class Grid:
         Returns:
             list: List of nodes with the specified ID.
         """
-        return [node for row in self.nodes for node in row if node.id == node_id]
+        return [self.node_at(index) for index in np.flatnonzero(self.zones == node_id)]
 
     def get_random_node(self) -> Square:
         """
@@ -261,12 +417,7 @@ class Grid:
         Returns:
             Square: A random non-barrier node.
         """
-        while True:
-            row = random.randint(0, self.size - 1)
-            col = random.randint(0, self.size - 1)
-            node = self.nodes[row][col]
-            if not node.is_barrier():
-                return node
+        return self.node_at(random.choice(self.walkable_nodes))
 
     def get_random_node_from_zones(self, zone_ids: List[int]) -> Optional[Square]:
         """
@@ -278,8 +429,13 @@ class Grid:
         Returns:
             Square: A random node from the specified zones, or None if no nodes found.
         """
-        possible_nodes = [node for row in self.nodes for node in row if node.id in zone_ids]
-        return random.choice(possible_nodes) if possible_nodes else None
+        key = tuple(zone_ids)
+        possible_nodes = self._zones_cache.get(key)
+        if possible_nodes is None:
+            zone_nodes = [self.zone_nodes[zone_id] for zone_id in set(key) if zone_id in self.zone_nodes]
+            possible_nodes = np.sort(np.concatenate(zone_nodes)) if zone_nodes else np.empty(0, dtype=np.intp)
+            self._zones_cache[key] = possible_nodes
+        return self.node_at(random.choice(possible_nodes)) if possible_nodes.size else None
 
     def get_random_node_from_zone(self, zone_id: int) -> Optional[Square]:
         """
@@ -291,8 +447,8 @@ class Grid:
         Returns:
             Square: A random node from the specified zone, or None if no nodes found.
         """
-        possible_nodes = [node for row in self.nodes for node in row if node.id == zone_id]
-        return random.choice(possible_nodes) if possible_nodes else None
+        possible_nodes = self.zone_nodes.get(zone_id)
+        return self.node_at(random.choice(possible_nodes)) if possible_nodes is not None else None
 
     # ####################################################################### #
     #                                   NODES                                 #
@@ -313,6 +469,41 @@ class Grid:
             raise ValueError("Square out of bounds")
         self.spawn = self.nodes[x][y]
 
+    def set_barrier(self, x: int, y: int, barrier: bool = True) -> None:
+        """
+        Make the square at the specified coordinates a barrier or clear it, updating the neighbours, weights and
+        walkable node index of the grid.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+            barrier (bool, optional): Whether the square becomes a barrier. Defaults to True.
+
+        Raises:
+            ValueError: If the coordinates are out of bounds.
+        """
+        if x < 0 or y < 0 or x >= self.size or y >= self.size:
+            raise ValueError("Square out of bounds")
+        self.barriers[x, y] = barrier
+        self._update_array()
+
+    def set_zone(self, x: int, y: int, zone_id: int) -> None:
+        """
+        Move the square at the specified coordinates to another zone, updating the walkable node index of the grid.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+            zone_id (int): The ID of the zone.
+
+        Raises:
+            ValueError: If the coordinates are out of bounds.
+        """
+        if x < 0 or y < 0 or x >= self.size or y >= self.size:
+            raise ValueError("Square out of bounds")
+        self.zones[x, y] = int(zone_id)
+        self._update_index()
+
     def set_key_square(self, x: int, y: int) -> bool:
         """
         Set the key square at the specified coordinates.
@@ -324,15 +515,34 @@ class Grid:
         Returns:
             bool: True if the operation was successful, False otherwise.
         """
-        for nodes in self.nodes:
-            for node in nodes:
-                if node.is_key:
-                    node.make_key()
+        self.key_node = None
         if x < 0 or y < 0 or x >= self.size or y >= self.size:
             return False
         self.nodes[x][y].make_key()
         return True
 
+    def set_tile_set(self, x: int, y: int, tile_id_list: List[int]) -> None:
+        """
+        Replace the tiles of the square at the specified coordinates and refresh its baked chunks.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+            tile_id_list (List[int]): The new tile IDs of the square.
+        """
+        node = self.nodes[x][y]
+        self.set_tiles(x, y, tile_id_list)
+
+        if self.animated[x, y] and node not in self.animated_nodes:
+            self.animated_nodes.append(node)
+        elif not self.animated[x, y] and node in self.animated_nodes:
+            self.animated_nodes.remove(node)
+        self._index_animated_cell(x, y)
+
+        self.floor_layer.invalidate(x, y)
+        self.objects_layer.invalidate(x, y)
+        self.floating_layer.invalidate(x, y)
+
     def set_exit_square(self, x: int, y: int) -> bool:
         """
         Set the exit square at the specified coordinates.
@@ -349,6 +559,28 @@ class Grid:
         self.nodes[x][y].make_exit()
         return True
 
+    def set_tiles(self, x: int, y: int, tile_id_list: List[int]) -> None:
+        """
+        Write the tiles of the square at the specified coordinates, one per tile map layer.
+
+        Missing layers are left empty and extra layers are added to the whole grid.
+
+        Args:
+            x (int): The x-coordinate of the square.
+            y (int): The y-coordinate of the square.
+            tile_id_list (List[int]): The tile IDs of the square.
+        """
+        missing_layers = len(tile_id_list) - len(self.tiles)
+        if missing_layers > 0:
+            empty = np.full((missing_layers, self.size, self.size), -1, dtype=self.tiles.dtype)
+            self.tiles = np.concatenate((self.tiles, empty))
+            self.tile_flags = np.concatenate((self.tile_flags, np.zeros(empty.shape, dtype=np.uint8)))
+
+        self.tiles[:, x, y] = -1
+        self.tiles[:len(tile_id_list), x, y] = tile_id_list
+        self.tile_flags[:, x, y] = classify_tiles(self.tiles[:, x, y])
+        self.animated[x, y] = (self.tile_flags[:, x, y] & TILE_ANIMATED).any()
+
     def is_key_square(self, x: int, y: int) -> bool:
         """
         Check if the square at the specified coordinates contains a key.
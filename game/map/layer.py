@@ -0,0 +1,180 @@
+import math
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pygame
+
+from utils.auxiliar import blit_all
+from utils.constants import CHUNK_SIZE, GRID_BACKGROUND
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                       TILE LAYER CLASS                                        #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+class TileLayer:
+    """
+    A static layer of the grid pre-rendered into fixed-size chunk surfaces.
+
+    The layer is baked once when the level is loaded and, on every frame, only the chunks that
+    intersect the camera are blitted. Chunks whose squares change are re-baked on the next draw.
+
+    Attributes:
+        grid (Grid): The grid whose squares are rendered into the layer.
+        layer (int): The flag of the tiles drawn on this layer, as sorted by classify_tiles.
+        static (bool): Whether the squares with animated tiles are left out, as they are drawn on every frame.
+        opaque (bool): Whether the chunks are drawn over the grid background or keep it transparent.
+        chunk_size (int): The number of squares per side of each chunk.
+        chunk_pixels (int): The size of each chunk in pixels.
+        total_chunks (int): The number of chunks per side of the grid.
+    """
+
+    def __init__(self, grid, layer: int, static: bool = False, opaque: bool = False, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize a TileLayer object.
+
+        Args:
+            grid (Grid): The grid whose squares are rendered into the layer.
+            layer (int): The flag of the tiles drawn on this layer, as sorted by classify_tiles.
+            static (bool, optional): Whether to leave out the squares with animated tiles. Defaults to False.
+            opaque (bool, optional): Whether the chunks are drawn over the grid background. Defaults to False.
+            chunk_size (int, optional): The number of squares per side of each chunk. Defaults to CHUNK_SIZE.
+        """
+        self.grid = grid
+        self.layer = layer
+        self.static = static
+        self.opaque = opaque
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * grid.gap
+        self.total_chunks = math.ceil(grid.size / chunk_size)
+
+        self._chunks: List[List[Optional[pygame.Surface]]] = []
+        self._dirty = set()
+
+    # ####################################################################### #
+    #                                   BAKE                                  #
+    # ####################################################################### #
+
+    def bake(self) -> None:
+        """
+        Render every chunk of the layer.
+        """
+        for _ in self.bake_steps():
+            pass
+
+    def bake_steps(self) -> Iterator[None]:
+        """
+        Render every chunk of the layer, yielding after each one so that the baking can be spread over several frames.
+
+        Yields:
+            None: After each rendered chunk.
+        """
+        self._chunks = [[None] * self.total_chunks for _ in range(self.total_chunks)]
+        self._dirty.clear()
+        for x in range(self.total_chunks):
+            for y in range(self.total_chunks):
+                self._chunks[x][y] = self._bake_chunk(x, y)
+                yield
+
+    def invalidate(self, row: int, col: int) -> None:
+        """
+        Mark the chunk containing the given square to be rendered again on the next draw.
+
+        Args:
+            row (int): The row index of the square.
+            col (int): The column index of the square.
+        """
+        self._dirty.add((row // self.chunk_size, col // self.chunk_size))
+
+    def _bake_chunk(self, chunk_x: int, chunk_y: int) -> Optional[pygame.Surface]:
+        """
+        Render the squares of a chunk into a new surface.
+
+        Args:
+            chunk_x (int): The horizontal index of the chunk.
+            chunk_y (int): The vertical index of the chunk.
+
+        Returns:
+            pygame.Surface: The chunk surface, or None if none of its squares has tiles in this layer.
+        """
+        sprite_sheet = self.grid.sprite_sheet
+        if sprite_sheet is None:
+            return None
+
+        first_row = chunk_x * self.chunk_size
+        first_col = chunk_y * self.chunk_size
+        last_row = min(first_row + self.chunk_size, self.grid.size)
+        last_col = min(first_col + self.chunk_size, self.grid.size)
+
+        # Tiles of the chunk on this layer, square after square and in tile map order within each square
+        tiles = self.grid.tiles[:, first_row:last_row, first_col:last_col]
+        drawn = (self.grid.tile_flags[:, first_row:last_row, first_col:last_col] & self.layer) != 0
+        if self.static:
+            drawn &= ~self.grid.animated[first_row:last_row, first_col:last_col]
+        layers, rows, cols = np.nonzero(drawn)
+        if not layers.size:
+            return None
+
+        order = np.lexsort((layers, cols, rows))
+        tile_ids = tiles[layers, rows, cols][order].tolist()
+        positions = zip((rows[order] * self.grid.gap).tolist(), (cols[order] * self.grid.gap).tolist())
+
+        chunk = self._create_chunk()
+        for tile_id, position in zip(tile_ids, positions):
+            chunk.blit(sprite_sheet.get_sprite_by_number(tile_id), position)
+        return chunk
+
+    def _create_chunk(self) -> pygame.Surface:
+        """
+        Create an empty chunk surface.
+
+        Returns:
+            pygame.Surface: A surface filled with the grid background, transparent unless the layer is opaque.
+        """
+        chunk = pygame.Surface((self.chunk_pixels, self.chunk_pixels))
+        chunk.fill(GRID_BACKGROUND)
+        if not self.opaque:
+            chunk.set_colorkey(GRID_BACKGROUND, pygame.RLEACCEL)
+        return chunk
+
+    # ####################################################################### #
+    #                                   DRAW                                  #
+    # ####################################################################### #
+
+    def draw(self, surface: pygame.Surface, offset: pygame.math.Vector2) -> None:
+        """
+        Blit the chunks of the layer that intersect the visible area.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            offset (pygame.math.Vector2): The camera offset.
+        """
+        blit_all(surface, self.draw_commands(surface, offset))
+
+    def draw_commands(self, surface: pygame.Surface, offset: pygame.math.Vector2) -> List[tuple]:
+        """
+        Get the blits of the chunks of the layer that intersect the visible area, re-baking the changed ones.
+
+        Args:
+            surface (pygame.Surface): The surface the layer is drawn on.
+            offset (pygame.math.Vector2): The camera offset.
+
+        Returns:
+            List[tuple]: The (chunk, position) pairs to blit.
+        """
+        for chunk_x, chunk_y in self._dirty:
+            self._chunks[chunk_x][chunk_y] = self._bake_chunk(chunk_x, chunk_y)
+        self._dirty.clear()
+
+        region = self.grid.visible_region(offset, surface.get_size())
+        if not region.width or not region.height:
+            return []
+
+        commands = []
+        for chunk_x in range(region.left // self.chunk_size, (region.right - 1) // self.chunk_size + 1):
+            for chunk_y in range(region.top // self.chunk_size, (region.bottom - 1) // self.chunk_size + 1):
+                chunk = self._chunks[chunk_x][chunk_y]
+                if chunk is not None:
+                    commands.append(
+                        (chunk, (chunk_x * self.chunk_pixels - offset.x, chunk_y * self.chunk_pixels - offset.y)))
+        return commands
@@ -1,8 +1,10 @@
-from typing import Tuple
+from typing import List, Tuple
 
 import pygame
 
+from game.map.compiler import TILE_FLOATING, TILE_FLOOR, TILE_OBJECT
 from game.sprites.spritesheet import SpriteSheet
+from utils.auxiliar import blit_all
 from utils.constants import *
 
 
@@ -13,91 +15,113 @@ from utils.constants import *
 
 class Square:
     """
-    A class representing a square grid cell in the pathfinding visualization grid.
+    A lightweight view over a cell of the grid.
+
+    The state of the cell (barrier flag, zone ID, weight, tiles, neighbours) lives in the arrays of the grid, so
+    squares only keep their coordinates. Animations are driven by the shared clock of the grid.
 
     Attributes:
+        grid (Grid): The grid the square belongs to.
         row (int): The row index of the square.
         col (int): The column index of the square.
+        index (int): The flat index of the square in the grid arrays.
         x (float): The x-coordinate of the center of the square.
         y (float): The y-coordinate of the center of the square.
         size (int): The size of the square.
-        total_rows (int): The total number of rows in the grid.
-        total_cols (int): The total number of columns in the grid.
-        neighbors (list): A list of neighboring squares.
-        barriers (list): A list of surrounding barriers.
-        id (int): The identification number of the square.
-        barrier (bool): A flag indicating whether the square is a barrier.
         color (tuple): The color of the square.
-        weight (int): The weight of the square used in pathfinding algorithms.
-        hover (bool): A flag indicating whether the square is being hovered over.
-        rect (pygame.Rect): The rectangle representing the square.
     """
 
-    def __init__(self, row, col, size, total_rows, total_cols, weight):
+    __slots__ = ('grid', 'row', 'col', 'index', 'x', 'y', 'size')
+
+    color = GRID_BACKGROUND
+
+    def __init__(self, grid, row, col):
         """
         Initializes a Square object with the given parameters.
 
         Args:
+            grid (Grid): The grid the square belongs to.
             row (int): The row index of the square.
             col (int): The column index of the square.
-            size (int): The size of the square.
-            total_rows (int): The total number of rows in the grid.
-            total_cols (int): The total number of columns in the grid.
-            weight (int): The weight of the square used in pathfinding algorithms.
 
         Returns:
             None
         """
-        super().__init__()
-
         # Grid properties
+        self.grid = grid
         self.row = row
         self.col = col
-        self.x = (row * size) + size * 0.5
-        self.y = (col * size) + size * 0.5
-        self.size = size
-        self.total_rows = total_rows
-        self.total_cols = total_cols
-
-        # Neighbors and barriers
-        self.neighbors = []
-        self.barriers = []
-
-        # Square identification and characteristics
-        self.id = -1
-        self.tile_id = []
-        self.barrier = False
-        self.color = GRID_BACKGROUND
-        self.weight = weight
-        self.hover = False
-
-        # Image and rectangle for rendering
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill(WHITE)
-        self.rect = self.image.get_rect()
-        self.rect.center = (self.x, self.y)
-        self.rect = pygame.Rect((row * size), (col * size), size + 1, size + 1)
-
-        # Additional properties
-        self.is_key = False
-        self.is_exit = False
-
-        # Animation attributes
-        self._current_frame = 0
-        self._delay_frame = 2
-        self._pass_frame = self._delay_frame
-        self._jump_frame = 1
-        self._state = 0
-
-        # Key animation attributes
-        self._key_offset = 0
-        self._key_speed = 0.25
-        self._key_limit = 1.5
+        self.index = row * grid.size + col
+        self.size = grid.gap
+        self.x = (row * self.size) + self.size * 0.5
+        self.y = (col * self.size) + self.size * 0.5
 
     # ####################################################################### #
     #                                VARIABLES                                #
     # ####################################################################### #
 
+    @property
+    def id(self) -> int:
+        """The identification number (zone) of the square."""
+        return int(self.grid.zones[self.row, self.col])
+
+    @property
+    def barrier(self) -> bool:
+        """A flag indicating whether the square is a barrier."""
+        return bool(self.grid.barriers[self.row, self.col])
+
+    @property
+    def weight(self) -> int:
+        """The weight of the square used in pathfinding algorithms."""
+        return int(self.grid.weights[self.row, self.col])
+
+    @property
+    def tile_id(self) -> list:
+        """The tile IDs of the square, one per tile map layer."""
+        return self.grid.tiles[:, self.row, self.col].tolist()
+
+    @property
+    def is_key(self) -> bool:
+        """A flag indicating whether the square holds the key."""
+        return self.grid.key_node is self
+
+    @property
+    def is_exit(self) -> bool:
+        """A flag indicating whether the square is an exit."""
+        return bool(self.grid.exits[self.row, self.col])
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """The rectangle representing the square."""
+        return pygame.Rect((self.row * self.size), (self.col * self.size), self.size + 1, self.size + 1)
+
+    @property
+    def neighbors(self) -> list:
+        """The accessible neighbouring squares."""
+        return [self.grid.node_at(index) for index in self.grid.adjacency[self.index] if index >= 0]
+
+    @property
+    def barriers(self) -> list:
+        """The surrounding barriers, with diagonal barriers between two open sides listed twice."""
+        barriers = self.grid.barriers
+        last = self.grid.size - 1
+        row, col = self.row, self.col
+        nodes = []
+
+        for row_step, col_step in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            r, c = row + row_step, col + col_step
+            if 0 <= r <= last and 0 <= c <= last and barriers[r, c]:
+                nodes.append(self.grid.nodes[r][c])
+
+        for row_step, col_step in ((1, -1), (-1, -1), (1, 1), (-1, 1)):
+            r, c = row + row_step, col + col_step
+            if 0 <= r <= last and 0 <= c <= last and barriers[r, c]:
+                if not barriers[r, col] and not barriers[row, c]:
+                    nodes.append(self.grid.nodes[r][c])
+                nodes.append(self.grid.nodes[r][c])
+
+        return nodes
+
     def set_id(self, node_id: int) -> None:
         """
         Set the identification number of the square.
@@ -108,7 +132,7 @@ class Square:
         Returns:
             None
         """
-        self.id = int(node_id)
+        self.grid.set_zone(self.row, self.col, node_id)
 
     def get_id(self) -> int:
         """
@@ -119,18 +143,6 @@ class Square:
         """
         return self.id
 
-    def set_tile_id(self, tile_id: int) -> None:
-        """
-        Set the tile identification number of the square.
-
-        Args:
-            tile_id (int): The tile identification number to be set.
-
-        Returns:
-            None
-        """
-        self.tile_id.append(int(tile_id))
-
     # ####################################################################### #
     #                                  DRAW                                   #
     # ####################################################################### #
@@ -150,10 +162,10 @@ class Square:
         position_y = offset.y + self.size // 2
         pygame.draw.rect(win, self.color, ((self.x - position_x), (self.y - position_y), self.size, self.size))
 
-    def _draw_sprite(self, win: pygame.Surface, sprite_id: int, sprite_sheet: SpriteSheet,
-                     offset: pygame.math.Vector2) -> None:
+    def _sprite_command(self, win: pygame.Surface, sprite_id: int, sprite_sheet: SpriteSheet,
+                        offset: pygame.math.Vector2) -> Tuple[pygame.Surface, tuple]:
         """
-        Draw a sprite on the given window.
+        Get the blit that draws a sprite on the given window.
 
         Args:
             win (pygame.Surface): The window surface to draw on.
@@ -162,7 +174,7 @@ class Square:
             offset (pygame.math.Vector2): The offset from the origin to draw the sprite.
 
         Returns:
-            None
+            Tuple[pygame.Surface, tuple]: The sprite image and the position to blit it at.
         """
         if sprite_id < 0 or sprite_sheet is None:
             self._draw_rect(win, offset)
@@ -171,40 +183,34 @@ class Square:
         position_y = offset.y + self.size // 2
 
         tile = sprite_sheet.get_sprite_by_number(sprite_id)
-        win.blit(tile, (self.x - position_x, self.y - position_y))
+        return tile, (self.x - position_x, self.y - position_y)
 
-    def _animate(self, tile_id: int) -> int:
+    def draw(
+            self,
+            win: pygame.Surface,
+            sprite_sheet: SpriteSheet,
+            offset: pygame.math.Vector2 = None,
+            only_float: bool = False,
+            only_floor: bool = False,
+            key_sheet: SpriteSheet = None
+    ) -> None:
         """
-        Animate the tile by updating its current frame and returning the updated tile ID.
+        Draw the square on the window surface.
 
         Args:
-            tile_id (int): The ID of the tile to animate.
+            win (pygame.Surface): The window surface to draw on.
+            sprite_sheet (SpriteSheet): The sprite sheet containing the sprites.
+            offset (pygame.math.Vector2, optional): The offset from the origin to draw the square. Defaults to None.
+            only_float (bool, optional): A flag indicating whether to draw only floating tiles. Defaults to False.
+            only_floor (bool, optional): A flag indicating whether to draw only floor tiles. Defaults to False.
+            key_sheet (SpriteSheet, optional): The sprite sheet containing the key. Defaults to None.
 
         Returns:
-            int: The updated ID of the animated tile.
+            None
         """
-        self._current_frame += 1
-        if self._current_frame >= 3:
-            self._current_frame = 0
-
-        if self._pass_frame == 0:
-            self._current_frame += 1
-            self._pass_frame = self._delay_frame
-        else:
-            self._pass_frame -= 1
-
-        if tile_id in TILE_SCREEN:
-            distance = 2
-        else:
-            distance = 1
-
-        jump = distance * self._current_frame
-        if self._current_frame > 0:
-            jump += 1
+        blit_all(win, self.draw_commands(win, sprite_sheet, offset, only_float, only_floor, key_sheet))
 
-        return tile_id + jump
-
-    def draw(
+    def draw_commands(
             self,
             win: pygame.Surface,
             sprite_sheet: SpriteSheet,
@@ -212,9 +218,9 @@ class Square:
             only_float: bool = False,
             only_floor: bool = False,
             key_sheet: SpriteSheet = None
-    ) -> None:
+    ) -> List[tuple]:
         """
-        Draw the square on the window surface.
+        Get the blits that draw the square on the window surface, in drawing order.
 
         Args:
             win (pygame.Surface): The window surface to draw on.
@@ -225,10 +231,10 @@ class Square:
             key_sheet (SpriteSheet, optional): The sprite sheet containing the key. Defaults to None.
 
         Returns:
-            None
+            List[tuple]: The (image, position) pairs to blit, empty if the square is out of the window.
         """
         if offset is None:
-            return
+            return []
 
         position_x = offset.x + self.size // 2
         position_y = offset.y + self.size // 2
@@ -241,34 +247,107 @@ class Square:
 
         if top_left_x + self.size * 2 < 0 or top_left_x > win_width or \
                 top_left_y + self.size * 2 < 0 or top_left_y > win_height:
-            return
+            return []
 
         if only_floor:
-            tiles_to_draw = [sprite_id for sprite_id in self.tile_id if sprite_id in GROUND_TILES]
+            tiles_to_draw = self.floor_tiles()
         elif only_float:
-            tiles_to_draw = [sprite_id for sprite_id in self.tile_id if sprite_id in FLOATING_TILES and sprite_id >= 0]
+            tiles_to_draw = self.floating_tiles()
         else:
-            animated_tile_found = False
-            tiles_to_draw = []
-            for sprite_id in self.tile_id:
-                if sprite_id not in GROUND_TILES and sprite_id >= 0 and sprite_id not in FLOATING_TILES:
-                    if sprite_id in ANIMATED_TILES and not animated_tile_found:
-                        tiles_to_draw.append(self._animate(sprite_id))
-                        animated_tile_found = True
-                    else:
-                        tiles_to_draw.append(sprite_id)
-
-        if tiles_to_draw:
-            for sprite_id in tiles_to_draw:
-                self._draw_sprite(win, sprite_id, sprite_sheet, offset)
-
-        if key_sheet is not None and self.is_key and not only_float:
-            temp = offset + pygame.math.Vector2(0, self._key_offset)
-            self._key_offset += self._key_speed
-            if abs(self._key_offset) >= self._key_limit:
-                self._key_speed *= -1
-                self._key_offset += self._key_speed
-            self._draw_sprite(win, 79, key_sheet, temp)
+            tiles_to_draw = self.object_tiles()
+            animated_cell = self.grid.animated_cells.get(self.index)
+            if animated_cell is not None:
+                tiles_to_draw, animated_slot = animated_cell
+                tiles_to_draw = list(tiles_to_draw)
+                tiles_to_draw[animated_slot] = self.grid.clock.animate(tiles_to_draw[animated_slot])
+
+        commands = [self._sprite_command(win, sprite_id, sprite_sheet, offset) for sprite_id in tiles_to_draw]
+
+        if key_sheet is not None and not only_float:
+            commands.extend(self.key_commands(win, key_sheet, offset))
+
+        return commands
+
+    def draw_key(self, win: pygame.Surface, key_sheet: SpriteSheet, offset: pygame.math.Vector2) -> None:
+        """
+        Draw the floating key on the square, if the square holds it.
+
+        Args:
+            win (pygame.Surface): The window surface to draw on.
+            key_sheet (SpriteSheet): The sprite sheet containing the key.
+            offset (pygame.math.Vector2): The offset from the origin to draw the key.
+
+        Returns:
+            None
+        """
+        blit_all(win, self.key_commands(win, key_sheet, offset))
+
+    def key_commands(self, win: pygame.Surface, key_sheet: SpriteSheet, offset: pygame.math.Vector2) -> List[tuple]:
+        """
+        Get the blit that draws the floating key on the square, if the square holds it.
+
+        Args:
+            win (pygame.Surface): The window surface to draw on.
+            key_sheet (SpriteSheet): The sprite sheet containing the key.
+            offset (pygame.math.Vector2): The offset from the origin to draw the key.
+
+        Returns:
+            List[tuple]: The (image, position) pair of the key, empty if the square does not hold it.
+        """
+        if not self.is_key:
+            return []
+
+        temp = offset + pygame.math.Vector2(0, self.grid.clock.key_offset)
+        return [self._sprite_command(win, 79, key_sheet, temp)]
+
+    # ####################################################################### #
+    #                                  LAYERS                                 #
+    # ####################################################################### #
+
+    def floor_tiles(self) -> list:
+        """
+        Get the tiles of the square drawn below everything else.
+
+        Returns:
+            list: The floor tile IDs of the square.
+        """
+        return self.grid.layer_tiles(self.row, self.col, TILE_FLOOR)
+
+    def object_tiles(self) -> list:
+        """
+        Get the tiles of the square drawn between the floor and the entities.
+
+        Returns:
+            list: The object tile IDs of the square.
+        """
+        return self.grid.layer_tiles(self.row, self.col, TILE_OBJECT)
+
+    def floating_tiles(self) -> list:
+        """
+        Get the tiles of the square drawn over the entities.
+
+        Returns:
+            list: The floating tile IDs of the square.
+        """
+        return self.grid.layer_tiles(self.row, self.col, TILE_FLOATING)
+
+    def static_object_tiles(self) -> list:
+        """
+        Get the object tiles of the square if none of them is animated.
+
+        Returns:
+            list: The object tile IDs of the square, or an empty list if the square is animated.
+        """
+        return [] if self.is_animated() else self.object_tiles()
+
+    def is_animated(self) -> bool:
+        """
+        Check if any of the object tiles of the square is animated.
+
+        Returns:
+            bool: True if the square has to be drawn on every frame, False otherwise.
+        """
+        return bool(self.grid.animated[self.row, self.col])
 
     # ####################################################################### #
     #                                POSITION                                 #
@@ -312,7 +391,7 @@ class Square:
 
     def set_tile_set(self, tile_id_list) -> None:
         """
-        Set the tile set for the square.
+        Set the tile set for the square, refreshing the baked chunks of the grid.
 
         Args:
             tile_id_list (list): List of tile IDs.
@@ -320,7 +399,7 @@ class Square:
         Returns:
             None
         """
-        self.tile_id = tile_id_list
+        self.grid.set_tile_set(self.row, self.col, tile_id_list)
 
     def get_weight(self) -> int:
         """
@@ -347,7 +426,8 @@ class Square:
         Returns:
             bool: True if the square is on the border, False otherwise.
         """
-        return self.col == 0 or self.row == 0 or self.col >= self.total_cols - 1 or self.row >= self.total_rows - 1
+        last = self.grid.size - 1
+        return self.col == 0 or self.row == 0 or self.col >= last or self.row >= last
 
     def reset(self) -> None:
         """
@@ -356,8 +436,7 @@ class Square:
         Returns:
             None
         """
-        self.barrier = False
-        self.color = GRID_BACKGROUND
+        self.grid.set_barrier(self.row, self.col, False)
 
     def make_barrier(self) -> None:
         """
@@ -366,7 +445,7 @@ class Square:
         Returns:
             None
         """
-        self.barrier = True
+        self.grid.set_barrier(self.row, self.col, True)
 
     def make_key(self) -> None:
         """
@@ -375,7 +454,7 @@ class Square:
         Returns:
             None
         """
-        self.is_key = not self.is_key
+        self.grid.key_node = None if self.is_key else self
 
     def make_exit(self) -> None:
         """
@@ -384,7 +463,7 @@ class Square:
         Returns:
             None
         """
-        self.is_exit = True
+        self.grid.exits[self.row, self.col] = True
 
     def make_room(self, room_id) -> None:
         """
@@ -396,126 +475,8 @@ class Square:
         Returns:
             None
         """
-        self.barrier = False
         self.set_id(room_id)
-
-    # ####################################################################### #
-    #                                NEIGHBOURS                               #
-    # ####################################################################### #
-
-    def surrounding_barrier(self, grid) -> None:
-        """
-        Update the weights of neighboring squares if the current square is a barrier.
-
-        Args:
-            grid (Grid): The grid containing the squares.
-
-        Returns:
-            None
-        """
-        bottom = self.row == self.total_rows - 1
-        top = self.row == 0
-        rightmost = self.col == self.total_cols - 1
-        leftmost = self.col == 0
-
-        if self.is_barrier():
-            if not bottom:
-                grid.nodes[self.row + 1][self.col].weight += WEIGHT
-            if not rightmost:
-                grid.nodes[self.row][self.col + 1].weight += WEIGHT
-            if not top:
-                grid.nodes[self.row - 1][self.col].weight += WEIGHT
-            if not leftmost:
-                grid.nodes[self.row][self.col - 1].weight += WEIGHT
-
-    def add_neighbour(self, node, force_barrier: bool = False) -> None:
-        """
-        Add a node as a neighbor if it's not a barrier.
-
-        Args:
-            node (Square): The node to be added as a neighbor.
-            force_barrier (Bool): Whether the node must be always a barrier.
-
-        Returns:
-            None
-        """
-        if node.is_barrier() or force_barrier:
-            self.barriers.append(node)
-        else:
-            self.neighbors.append(node)
-
-    def update_neighbors(self, grid) -> None:
-        """
-        Update the neighboring squares of the square based on its position.
-
-        Args:
-            grid (Grid): The grid containing the squares.
-
-        Returns:
-            None
-        """
-        self.neighbors = []
-        self.barriers = []
-
-        bottom = self.row == self.total_rows - 1
-        top = self.row == 0
-        rightmost = self.col == self.total_cols - 1
-        leftmost = self.col == 0
-
-        down_node = up_node = right_node = left_node = None
-        left_down_node = right_down_node = left_up_node = right_up_node = None
-
-        # Assign accessible cardinal nodes
-        if not bottom:
-            down_node = grid.nodes[self.row + 1][self.col]
-        if not top:
-            up_node = grid.nodes[self.row - 1][self.col]
-        if not rightmost:
-            right_node = grid.nodes[self.row][self.col + 1]
-        if not leftmost:
-            left_node = grid.nodes[self.row][self.col - 1]
-
-        # Assign accessible diagonal nodes
-        if not bottom and not leftmost:
-            left_down_node = grid.nodes[self.row + 1][self.col - 1]
-        if not bottom and not rightmost:
-            right_down_node = grid.nodes[self.row + 1][self.col + 1]
-        if not top and not leftmost:
-            left_up_node = grid.nodes[self.row - 1][self.col - 1]
-        if not top and not rightmost:
-            right_up_node = grid.nodes[self.row - 1][self.col + 1]
-
-        # Cardinal checks & additions
-        if down_node is not None:
-            self.add_neighbour(down_node)
-        if up_node is not None:
-            self.add_neighbour(up_node)
-        if right_node is not None:
-            self.add_neighbour(right_node)
-        if left_node is not None:
-            self.add_neighbour(left_node)
-
-        # Diagonal checks & additions
-        if left_down_node is not None and (
-                not left_node.is_barrier() and not down_node.is_barrier()):
-            self.add_neighbour(left_down_node)
-        if left_down_node is not None and left_down_node.is_barrier():
-            self.add_neighbour(left_down_node, force_barrier=True)
-        if left_up_node is not None and (
-                not left_node.is_barrier() and not up_node.is_barrier()):
-            self.add_neighbour(left_up_node)
-        if left_up_node is not None and left_up_node.is_barrier():
-            self.add_neighbour(left_up_node, force_barrier=True)
-        if right_down_node is not None and (
-                not right_node.is_barrier() and not down_node.is_barrier()):
-            self.add_neighbour(right_down_node)
-        if right_down_node is not None and right_down_node.is_barrier():
-            self.add_neighbour(right_down_node, force_barrier=True)
-        if right_up_node is not None and (
-                not right_node.is_barrier() and not up_node.is_barrier()):
-            self.add_neighbour(right_up_node)
-        if right_up_node is not None and right_up_node.is_barrier():
-            self.add_neighbour(right_up_node, force_barrier=True)
+        self.grid.set_barrier(self.row, self.col, False)
 
     # ####################################################################### #
     #                                  EQUALS                                 #
@@ -4,15 +4,22 @@ from utils.constants import SQUARE_SIZE
 
 
 class SpriteSheet:
-    def __init__(self, filename: str, total_columns: int, total_rows: int, tile_size: int = SQUARE_SIZE):
+    def __init__(self, filename: str, total_columns: int, total_rows: int, tile_size: int = SQUARE_SIZE,
+                 lazy: bool = False):
         """
         Initialize a SpriteSheet object.
 
+        Every frame of the sheet is sliced once, and its horizontal mirror is made the first time it is requested,
+        so retrieving a sprite never allocates a new surface after that, whichever way it faces, and sheets that are
+        never drawn mirrored keep no mirrored copies. The returned surfaces are shared and must not be modified.
+
         Args:
             filename (str): The filename of the sprite sheet image.
             total_columns (int): The total number of columns in the sprite sheet.
             total_rows (int): The total number of rows in the sprite sheet.
             tile_size (int): The size of each tile in pixels. Defaults to SQUARE_SIZE.
+            lazy (bool): Whether to slice each frame the first time it is requested instead of on load,
+                useful for huge sheets of which only a few frames are used. Defaults to False.
 
         Returns:
             None
@@ -23,10 +30,22 @@ class SpriteSheet:
             (total_columns * tile_size, total_rows * tile_size))
         self.tile_size = tile_size
         self.total_columns = total_columns
+        self.total_rows = total_rows
+        self.lazy = lazy
+
+        self._frames = [None] * (total_columns * total_rows)
+        self._flipped_frames = [None] * (total_columns * total_rows)
+        self._empty_frame = self._slice(total_columns, total_rows)
+
+        if not lazy:
+            for number in range(len(self._frames)):
+                self._frames[number] = self._slice(number % total_columns, number // total_columns)
+            # Every frame has been sliced, so the scaled sheet is no longer needed
+            self.sprite_sheet = None
 
-    def get_sprite(self, x: int, y: int) -> pygame.Surface:
+    def _slice(self, x: int, y: int) -> pygame.Surface:
         """
-        Retrieve a sprite from the sprite sheet at the specified position.
+        Cut a frame out of the sprite sheet, converted to the display pixel format when possible.
 
         Args:
             x (int): The column index of the sprite.
@@ -36,22 +55,57 @@ class SpriteSheet:
             pygame.Surface: The sprite image.
         """
         sprite = pygame.Surface((self.tile_size, self.tile_size))
-        sprite.set_colorkey((0, 0, 0))
         sprite.blit(self.sprite_sheet, (0, 0), (x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return sprite
+
+    def get_sprite(self, x: int, y: int, flipped: bool = False) -> pygame.Surface:
+        """
+        Retrieve a sprite from the sprite sheet at the specified position.
+
+        Args:
+            x (int): The column index of the sprite.
+            y (int): The row index of the sprite.
+            flipped (bool): Whether to retrieve the sprite mirrored horizontally. Defaults to False.
+
+        Returns:
+            pygame.Surface: The sprite image.
+        """
+        if not (0 <= x < self.total_columns and 0 <= y < self.total_rows):
+            return self._empty_frame
+
+        number = y * self.total_columns + x
+        sprite = self._frames[number]
+        if sprite is None:
+            sprite = self._frames[number] = self._slice(x, y)
+
+        if flipped:
+            flipped_sprite = self._flipped_frames[number]
+            if flipped_sprite is None:
+                flipped_sprite = self._flipped_frames[number] = pygame.transform.flip(sprite, True, False)
+            return flipped_sprite
+
         return sprite
 
-    def get_sprite_by_number(self, number: int) -> pygame.Surface:
+    def get_sprite_by_number(self, number: int, flipped: bool = False) -> pygame.Surface:
         """
         Retrieve a sprite from the sprite sheet based on its sequential number.
 
         Args:
             number (int): The sequential number of the sprite.
+            flipped (bool): Whether to retrieve the sprite mirrored horizontally. Defaults to False.
 
         Returns:
             pygame.Surface: The sprite image.
         """
         if number < 0:
             return self.get_sprite(10, 7)
+        if number < len(self._frames):
+            sprite = self._flipped_frames[number] if flipped else self._frames[number]
+            if sprite is not None:
+                return sprite
         x = number % self.total_columns
         y = number // self.total_columns
-        return self.get_sprite(x, y)
+        return self.get_sprite(x, y, flipped)
@@ -2,7 +2,8 @@ import pygame
 from pygame import Surface
 
 from game.entities.player import Player
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
+from utils.auxiliar import blit_all
 from utils.paths.assets_paths import UI_ASSETS
 
 
@@ -17,7 +18,7 @@ class Bar(pygame.sprite.Sprite):
         self.tile_id = 1
 
         # Preload sprite sheet
-        self._sprite_sheet = SpriteSheet(UI_ASSETS, 20, 11, self.tile_size)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(UI_ASSETS, 20, 11, self.tile_size)
 
         # Initialize tile during initialization
         self.tile = self._sprite_sheet.get_sprite_by_number(self.tile_id)
@@ -43,13 +44,16 @@ class Bar(pygame.sprite.Sprite):
         self.tile = self._sprite_sheet.get_sprite_by_number(self.tile_id)
 
     def draw(self, **kwargs):
+        blit_all(kwargs.get('surface'), self.draw_commands(**kwargs))
+
+    def draw_commands(self, **kwargs):
         surface = kwargs.pop('surface', None)
         if surface is not None:
             if not isinstance(surface, Surface):
                 raise TypeError("surface must be an instance of pygame.Surface class")
 
         # Draw the preloaded tile image directly
-        surface.blit(self.tile, (self._x, self._y))
+        return [(self.tile, (self._x, self._y))]
 
     def notified(self, **kwargs):
         pass
@@ -2,7 +2,8 @@ import pygame
 from pygame import Surface
 
 from game.entities.player import Player
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
+from utils.auxiliar import blit_all
 from utils.paths.assets_paths import UI_ICONS
 
 
@@ -18,7 +19,7 @@ class Keys(pygame.sprite.Sprite):
         self.tile_id = 36
 
         # Preload sprite sheet
-        self._sprite_sheet = SpriteSheet(UI_ICONS, 10, 9, self.tile_size)
+        self._sprite_sheet = ResourceManager.load_sprite_sheet(UI_ICONS, 10, 9, self.tile_size)
 
         # Initialize tile during initialization
         self.tile = self._sprite_sheet.get_sprite_by_number(self.tile_id)
@@ -31,9 +32,13 @@ class Keys(pygame.sprite.Sprite):
         self._y = rect.centery - self.tile_size / 2
 
     def draw(self, **kwargs):
+        blit_all(kwargs.get('surface'), self.draw_commands(**kwargs))
+
+    def draw_commands(self, **kwargs):
         surface = kwargs.pop('surface', None)
         if surface and isinstance(surface, Surface) and self.key_obtained:
-            surface.blit(self.tile, (self._x, self._y))
+            return [(self.tile, (self._x, self._y))]
+        return []
 
     def update(self, *args, **kwargs):
         player = kwargs.pop('player', None)
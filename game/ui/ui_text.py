@@ -2,6 +2,7 @@ import pygame
 from pygame import Surface
 
 from menu.prototypes.gui_prototypes import Text
+from utils.auxiliar import blit_all
 from utils.paths.assets_paths import FONT
 
 
@@ -21,12 +22,16 @@ class Message(pygame.sprite.Sprite, Text):
         self.groups = []
 
     def draw(self, **kwargs):
+        blit_all(kwargs.get('surface'), self.draw_commands(**kwargs))
+
+    def draw_commands(self, **kwargs):
         if self.active:
             surface = kwargs.pop('surface', None)
             if surface and isinstance(surface, Surface):
-                surface.blit(self.image, self.rect)
+                return [(self.image, self.rect)]
             else:
                 raise TypeError("surface must be an instance of pygame.Surface class")
+        return []
 
     def notified(self, **kwargs):
         message = kwargs.pop('text', None)
@@ -1,23 +1,31 @@
+import argparse
 import os
 import pygame
 import pygamepopup
 
 from managers.audio_manager import AudioManager
-from managers.game_manager import GameManager
 from managers.menu_manager import MenuManager
 from managers.scene_manager import SceneManager
+from utils.constants import PATH_WORKERS
+from utils.enums import Pacing
 
 os.environ['SDL_VIDEO_CENTERED'] = '1'  # You have to call this before pygame.init()
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description='Run the game.')
+    parser.add_argument('--pacing', choices=[pacing.value for pacing in Pacing], default=Pacing.TICK.value,
+                        help='how frames are paced: sleeping, busy waiting or vertical sync (default: tick)')
+    parser.add_argument('--path-workers', type=int, default=PATH_WORKERS, metavar='N',
+                        help='number of background processes searching the paths of the enemies, or 0 to search them '
+                             'on the main loop (default: %(default)s)')
+    arguments = parser.parse_args()
+
     pygame.init()
     pygamepopup.init()
 
     audio = AudioManager()
-    manager = SceneManager(audio)
-    game_scene = GameManager(manager, audio)
-    manager.stack_scene(game_scene)
+    manager = SceneManager(audio, Pacing.from_string(arguments.pacing), arguments.path_workers)
     menu_scene = MenuManager(manager, audio)
     manager.stack_scene(menu_scene)
 
@@ -1,4 +1,4 @@
-import json
+from typing import Generator
 
 import pygame
 from pygamepopup.components import InfoBox, Button
@@ -11,6 +11,7 @@ from game.entities.player import Player
 from game.groups.enemies_group import Enemies
 from game.groups.interface_group import Interface
 from game.groups.render_group import Camera
+from game.map.compiler import load_level
 from game.map.grid import Grid
 from game.map.level import Level
 from game.ui.ui_bar import Bar
@@ -25,28 +26,62 @@ from utils.paths.maps_paths import LEVELS
 
 
 class GameManager(Scene):
-    def __init__(self, manager, audio, level_number=1):
+    def __init__(self, manager, audio, level_number=1, compiled_level=None, room_graph=None):
+        for _ in self._build(manager, audio, level_number, compiled_level, room_graph):
+            pass
+
+    @classmethod
+    def assemble(cls, manager, audio, level_number=1, compiled_level=None,
+                 room_graph=None) -> Generator[None, None, 'GameManager']:
+        """
+        Build the scene of a level a step at a time, so that it can be spread over the frames of the running scene.
+
+        Args:
+            manager (SceneManager): The scene manager.
+            audio (AudioManager): The audio manager.
+            level_number (int, optional): The number of the level. Defaults to 1.
+            compiled_level (CompiledLevel, optional): The compiled data of the level. Defaults to None.
+            room_graph (RoomGraph, optional): The rooms already extracted from the compiled level. Defaults to None.
+
+        Yields:
+            None: After each step of the build.
+
+        Returns:
+            GameManager: The scene, once built.
+        """
+        scene = cls.__new__(cls)
+        yield from scene._build(manager, audio, level_number, compiled_level, room_graph)
+        return scene
+
+    def _build(self, manager, audio, level_number, compiled_level, room_graph) -> Generator[None, None, None]:
         Scene.__init__(self, manager)
 
         self.win = pygame.display.get_surface()
         self.win_size = self.win.get_width()
 
-        with open(LEVELS[level_number], 'r') as file:
-            data = file.read().replace('\n', '')
+        # The maps are compiled into a binary file the first time the level is loaded or after they change
+        if compiled_level is None:
+            compiled_level = load_level(LEVELS[level_number], MAP_SIZE)
 
-        self.level = Level(**json.loads(data))
+        self.level = Level(**compiled_level.data)
 
         self.player = None
         self.grid = Grid(
-            size=100,
+            size=MAP_SIZE,
             win=self.win,
             border_map_path=self.level.map.border_map_path,
             tile_map_path=self.level.map.tile_map_path,
             objects_map_path=self.level.map.objects_map_path,
             sprite_sheet_path=self.level.level_sprite_sheet.path,
             ss_columns=self.level.level_sprite_sheet.columns,
-            ss_rows=self.level.level_sprite_sheet.rows
+            ss_rows=self.level.level_sprite_sheet.rows,
+            compiled_level=compiled_level,
+            path_workers=manager.path_workers,
+            room_graph=room_graph,
+            bake=False
         )
+        yield
+        yield from self.grid.bake_steps()
 
         self.end_current_frame = -1
         self._end_delay_frame = 2
@@ -59,6 +94,7 @@ class GameManager(Scene):
         self.interface = Interface()
         self.level_ui = Indicator(self.win)
         self.audio = audio
+        yield
 
         self._start()
 
@@ -70,9 +106,7 @@ class GameManager(Scene):
         self.pause_menu = None
         self.death_menu = None
         self.finished_level_menu = None
-        self.game_finished_menu = None
-
-        self.set_menus()
+        self.game_finished_menu = None  # The menus are created by the scene manager when the level is entered
 
     def events(self, event_list):
         for event in event_list:
@@ -98,8 +132,7 @@ class GameManager(Scene):
             pair = DOOR_TILES[self.end_current_frame]
         count = 0
         for x, y in zip(self.level.coordinates.exit_x, self.level.coordinates.exit_y):
-            door = self.grid.get_node_from_array(x, y - 1)
-            door.set_tile_set([71, pair[count]])
+            self.grid.set_tile_set(x, y - 1, [71, pair[count]])
             count += 1
 
     def draw(self, screen):
@@ -123,15 +156,15 @@ class GameManager(Scene):
         if self.is_open_menu():
             self.menu_manager.display()
 
-        pygame.display.update()
-
     def update(self, **kwargs):
         if not self.is_open_menu() and self.end_current_frame < 0:
             kwargs['player'] = self.player
-            kwargs['player_mask'] = self.all_sprites.return_player_mask(self.player)
-            kwargs['enemy_mask'] = self._render()
+            kwargs['exposers'] = self.enemies.detect(self.player)
+            self._render()
             kwargs['language'] = self.manager.get_language()
             self.all_sprites.update(**kwargs)
+            self.grid.path_scheduler.run()
+            self.enemies.cast()
             self.interface.update(**kwargs)
 
     def notified(self):
@@ -176,14 +209,14 @@ class GameManager(Scene):
         self.manager.exit()
 
     def _close(self):
-        self._restart()
+        self.close_menu()
         self.audio.music_menu()
         self.manager.change_scene()
 
     def _advance(self):
         level_number = self.level.level_number
 
-        self._restart()
+        self.close_menu()
 
         if level_number == len(LEVELS):
             # Pantalla ganadora
@@ -235,8 +268,6 @@ class GameManager(Scene):
                 vertices.append(point2)
             self.all_sprites.save_enemy_mask(enemy, vertices)
 
-        return self.all_sprites.return_enemy_mask()
-
     def _add_player(self, player):
         self.player = player
         player.add(self.all_sprites)
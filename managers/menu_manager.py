@@ -43,7 +43,7 @@ class MenuManager(Scene):
         self.screen_list[self.current_screen].events(event_list)
 
     def draw(self, screen):
-        self.screen_list[self.current_screen].draw(screen)
+        return self.screen_list[self.current_screen].draw(screen)
 
     def update(self, **kwargs):
         pass
@@ -61,15 +61,22 @@ class MenuManager(Scene):
 
     def show_starting_screen(self):
         self.current_screen = 0
+        self.invalidate()
 
     def show_configuration_screen(self):
         self.current_screen = 1
+        self.invalidate()
 
     def show_credits_screen(self):
         self.current_screen = 2
+        self.invalidate()
 
     def show_splash_screen(self):
         self.current_screen = 3
+        self.invalidate()
+
+    def invalidate(self):
+        self.screen_list[self.current_screen].invalidate()
 
     def set_movement_option(self, option):
         self.manager.set_movement_option(option)
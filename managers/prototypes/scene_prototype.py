@@ -14,4 +14,10 @@ class Scene:
         raise NotImplemented("Not implemented here.")
 
     def draw(self, screen):
+        """
+        Draw the scene on the screen, which the scene manager presents afterwards.
+
+        Returns:
+            The areas of the screen that changed, None if it all did.
+        """
         raise NotImplemented("Not implemented here.")
@@ -2,6 +2,9 @@ import os
 import pygame
 from pygame.locals import *
 
+from game.sprites.spritesheet import SpriteSheet
+from utils.constants import SQUARE_SIZE
+
 
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                        RESOURCE MANAGER                                       #
@@ -9,6 +12,7 @@ from pygame.locals import *
 
 class ResourceManager(object):
     resources = {}
+    sprite_sheets = {}
 
     @classmethod
     def load_image(cls, name: str, color_key: int = None):
@@ -33,6 +37,29 @@ class ResourceManager(object):
 
             return image
 
+    @classmethod
+    def load_sprite_sheet(cls, name: str, total_columns: int, total_rows: int, tile_size: int = SQUARE_SIZE,
+                          lazy: bool = False) -> SpriteSheet:
+        """
+        Get the sprite sheet for the given image and layout, loading and scaling it only the first time.
+
+        The same instance is shared by every caller, so it must be treated as read-only.
+
+        Args:
+            name (str): The filename of the sprite sheet image.
+            total_columns (int): The total number of columns in the sprite sheet.
+            total_rows (int): The total number of rows in the sprite sheet.
+            tile_size (int): The size of each tile in pixels. Defaults to SQUARE_SIZE.
+            lazy (bool): Whether to slice the frames on demand when the sheet is first loaded. Defaults to False.
+
+        Returns:
+            SpriteSheet: The shared sprite sheet.
+        """
+        key = (name, total_columns, total_rows, tile_size)
+        if key not in cls.sprite_sheets:
+            cls.sprite_sheets[key] = SpriteSheet(name, total_columns, total_rows, tile_size, lazy)
+        return cls.sprite_sheets[key]
+
     @classmethod
     def load_coordinates(cls, index, filename):
         with open(filename, 'r') as file:
@@ -1,14 +1,22 @@
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Generator, List, Optional, Tuple
+
 import pygame
 
+from game.map.compiler import CompiledLevel, load_level
 from managers.game_manager import GameManager
-from utils.constants import FPS
+from utils.algorithms import PathScheduler, RoomGraph
+from utils.constants import FPS, LEVEL_BUILD_BUDGET, MAP_SIZE, PATH_WORKERS
 
 from utils.enums import Controls as Ctl
+from utils.enums import Pacing
 from utils.paths.maps_paths import LEVELS
 
 
 class SceneManager:
-    def __init__(self, audio):
+    def __init__(self, audio, pacing: Pacing = Pacing.TICK, path_workers: int = PATH_WORKERS):
         info = pygame.display.Info()  # You have to call this before pygame.display.set_mode()
         screen_width, screen_height = info.current_w, info.current_h
 
@@ -17,16 +25,25 @@ class SceneManager:
         window_width, window_height = screen_width - 30, screen_height - 90
         # window_width, window_height = 800, 800
 
-        self.screen = pygame.display.set_mode((window_width, window_height), pygame.FULLSCREEN)
+        self.pacing = pacing
+        self.path_workers = path_workers  # Background processes searching the paths of the enemies of every level
+        self.screen = self._set_mode((window_width, window_height))
         self.scene_stack = []
         self.clock = pygame.time.Clock()
         self.language = 'en'
 
         self.movement_option = Ctl.WASD
 
-        self.levels = []
-        self.set_levels(audio)
+        # The map and rooms of the next level are loaded in the background while the current one is played, and its
+        # scene is then built a few steps per frame on the main thread, as pygame is not safe to use from other threads
+        self.audio = audio
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-loader')
+        self._prefetched_level: Optional[int] = None
+        self._prefetched_map: Optional[Future] = None
+        self._builder: Optional[Generator[None, None, GameManager]] = None
+        self._prepared_scene: Optional[GameManager] = None
         self.menu_active = True
+        self._running = False
 
     def __str__(self):
         stack = ""
@@ -41,9 +58,149 @@ class SceneManager:
 
         return "SceneManager with the following scene stack:\n" + stack
 
-    def set_levels(self, audio):
-        for level_number in LEVELS.keys():
-            self.levels.append(GameManager(self, audio, level_number))
+    # ####################################################################### #
+    #                                 DISPLAY                                 #
+    # ####################################################################### #
+
+    def _set_mode(self, size: tuple) -> pygame.Surface:
+        """
+        Open the game window, synchronised with the display when the pacing asks for it.
+
+        Args:
+            size (tuple): The size of the window.
+
+        Returns:
+            pygame.Surface: The display surface.
+        """
+        if self.pacing == Pacing.VSYNC:
+            try:
+                # Vertical sync is only available on scaled or OpenGL displays
+                return pygame.display.set_mode(size, pygame.FULLSCREEN | pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print('Cannot enable vertical sync:', e)
+                self.pacing = Pacing.TICK
+
+        return pygame.display.set_mode(size, pygame.FULLSCREEN)
+
+    def _wait_frame(self) -> None:
+        """
+        Wait until the next frame is due, according to the pacing.
+        """
+        if self.pacing == Pacing.BUSY_LOOP:
+            self.clock.tick_busy_loop(FPS)
+        elif self.pacing == Pacing.VSYNC:
+            # Presenting already waits for the display, so the clock only keeps track of the frame time
+            self.clock.tick()
+        else:
+            self.clock.tick(FPS)
+
+    @staticmethod
+    def _present(rects: Optional[List[pygame.Rect]]) -> None:
+        """
+        Show what a scene has drawn, which happens exactly once per frame.
+
+        Args:
+            rects (List[pygame.Rect], optional): The areas of the screen that changed, as returned by the draw
+                method of the scene. None means the whole screen and an empty list means nothing changed.
+        """
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    # ####################################################################### #
+    #                                  LEVELS                                 #
+    # ####################################################################### #
+
+    def get_level(self, level_number: int) -> GameManager:
+        """
+        Get a freshly started scene for the given level, which is the prepared one if the level was prefetched. Any
+        part of it not yet prepared is finished now.
+
+        Args:
+            level_number (int): The number of the level.
+
+        Returns:
+            GameManager: The scene of the level.
+        """
+        if self._prefetched_level != level_number:
+            return GameManager(self, self.audio, level_number)
+
+        self._prepare(math.inf)
+        scene = self._prepared_scene
+        self._prefetched_level, self._prefetched_map, self._prepared_scene = None, None, None
+        return scene
+
+    def prefetch_level(self, level_number: int) -> None:
+        """
+        Start preparing the scene of the given level in the background, discarding any other prepared level.
+
+        Args:
+            level_number (int): The number of the level. Levels that do not exist are ignored.
+        """
+        if level_number not in LEVELS or self._prefetched_level == level_number:
+            return
+
+        self._discard()
+        self._prefetched_level = level_number
+        self._prefetched_map = self._loader.submit(self._load_level, level_number)
+
+    @staticmethod
+    def _load_level(level_number: int) -> Tuple[CompiledLevel, RoomGraph]:
+        """
+        Load the map of a level and extract its rooms. Neither touches pygame, so this runs on the loader thread.
+
+        Args:
+            level_number (int): The number of the level.
+
+        Returns:
+            Tuple[CompiledLevel, RoomGraph]: The compiled data of the level and its rooms.
+        """
+        compiled_level = load_level(LEVELS[level_number], MAP_SIZE)
+        return compiled_level, RoomGraph.from_level(compiled_level)
+
+    def _prepare(self, budget: float = LEVEL_BUILD_BUDGET) -> None:
+        """
+        Build the scene of the prefetched level for at most the given time, once its map is loaded.
+
+        Args:
+            budget (float, optional): The milliseconds spent on building. An infinite budget waits for the map and
+                finishes the scene. Defaults to LEVEL_BUILD_BUDGET.
+        """
+        if self._prefetched_map is None or self._prepared_scene is not None:
+            return
+
+        if self._builder is None:
+            if math.isfinite(budget) and not self._prefetched_map.done():
+                return
+
+            compiled_level, room_graph = None, None
+            try:
+                compiled_level, room_graph = self._prefetched_map.result()
+            except Exception as e:
+                print('Cannot prefetch level', self._prefetched_level, ':', e)
+            self._builder = GameManager.assemble(self, self.audio, self._prefetched_level, compiled_level, room_graph)
+
+        deadline = time.perf_counter() + budget / 1000
+        try:
+            while time.perf_counter() < deadline:
+                next(self._builder)
+        except StopIteration as stop:
+            self._builder, self._prepared_scene = None, stop.value
+
+    def _discard(self) -> None:
+        """
+        Drop the prefetched level, whether its map is still loading, its scene is being built or it is ready.
+        """
+        if self._prefetched_map is not None:
+            self._prefetched_map.cancel()
+        if self._builder is not None:
+            self._builder.close()
+        if self._prepared_scene is not None:
+            self._leave(self._prepared_scene)
+
+        self._prefetched_level, self._prefetched_map = None, None
+        self._builder, self._prepared_scene = None, None
 
     def set_movement_option(self, option: Ctl):
         self.movement_option = option
@@ -60,43 +217,75 @@ class SceneManager:
     def get_language(self):
         return self.language
 
-    def loop(self, scene):
+    # ####################################################################### #
+    #                                  SCENES                                 #
+    # ####################################################################### #
+
+    def loop(self):
+        self._running = True
         pygame.event.clear()
 
         while len(self.scene_stack) > 0:
-            self.clock.tick(FPS)
+            scene = self.scene_stack[-1]
+            self._wait_frame()
             events = pygame.event.get()
             scene.events(events)
+
+            # The events may have changed the scene, which takes over on the next frame
+            if len(self.scene_stack) == 0 or self.scene_stack[-1] is not scene:
+                continue
+
             scene.update(movement_option=self.movement_option)
-            scene.draw(self.screen)
+            self._present(scene.draw(self.screen))
+            self._prepare()
 
-            pygame.display.flip()
+        self._running = False
+        self._discard()
+        self._loader.shutdown(wait=False, cancel_futures=True)
+        PathScheduler.shutdown()
 
     def run(self):
         # Debug
         # print("Running " + str(self))
         if len(self.scene_stack) > 0:
-            scene = self.scene_stack[len(self.scene_stack) - 1]
-            if isinstance(scene, GameManager):
-                scene.set_interface()
-                scene.set_menus()
-            self.loop(scene)
+            self._enter(self.scene_stack[-1])
+            # Scene changes requested from inside the loop are picked up on its next frame
+            if not self._running:
+                self.loop()
+
+    def _enter(self, scene):
+        if isinstance(scene, GameManager):
+            scene.set_interface()
+            scene.set_menus()
+            self.prefetch_level(scene.level.level_number + 1)
         else:
-            self.loop(None)
+            # The display still shows whatever was presented before the menu, so it is drawn again from scratch
+            scene.invalidate()
+            # The game is always started from the first level
+            self.prefetch_level(1)
+
+    @staticmethod
+    def _leave(scene) -> None:
+        """
+        Free what a scene holds outside the process once it is taken off the stack for good.
+
+        Args:
+            scene (Scene): The scene taken off the stack.
+        """
+        if isinstance(scene, GameManager):
+            scene.grid.path_scheduler.release()
 
     def exit(self):
         self.scene_stack = []
-        self.run()
 
     def change_scene(self):
-        if len(self.scene_stack) > 1:
-            current_scene = self.scene_stack.pop(0)  # Remove the current scene from the beginning of the stack
-            if self.menu_active:  # Check if either the menu or level 1 has to be appended to the stack
+        if len(self.scene_stack) > 0:
+            if self.menu_active:  # Check if either the menu or level 1 has to be on top of the stack
                 self.menu_active = False
-                self.scene_stack.append(self.levels[0])
+                self.scene_stack.append(self.get_level(1))
             else:
                 self.menu_active = True
-                self.scene_stack.append(current_scene)  # Put the current scene at the end of the stack
+                self._leave(self.scene_stack.pop())  # Release the level that was being played
 
             self.run()
 
@@ -104,17 +293,20 @@ class SceneManager:
         self.scene_stack.append(scene)
 
     def pop_scene(self):
-        self.scene_stack.pop(0)
+        self._leave(self.scene_stack.pop())
 
     def advance_level(self, next_level):
         # Debug
         # print("Changing to level ", next_level)
         # print(self)
 
-        self.scene_stack.pop(1)
-        self.scene_stack.append(self.levels[next_level-1])
+        self._leave(self.scene_stack.pop())
+        self.scene_stack.append(self.get_level(next_level))
         self.run()
 
     def go_to_menu(self):
-        self.scene_stack = [self.scene_stack[0], self.scene_stack[1]]
+        self.menu_active = True
+        for scene in self.scene_stack[1:]:
+            self._leave(scene)
+        self.scene_stack = [self.scene_stack[0]]
         self.run()
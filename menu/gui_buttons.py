@@ -65,6 +65,10 @@ class AbstractSwitch(ButtonSwitch):
     def activate(self):
         self.action_function()
 
+    def bounds(self):
+        # Every switch is drawn inside its frame
+        return self.rect.union(self.frame_rect)
+
 
 class SwitchVolume(AbstractSwitch):
     def __init__(self, screen):
@@ -57,6 +57,15 @@ class ElementoGUI:
         else:
             return False
 
+    def bounds(self):
+        """
+        Get the area of the screen the element is drawn on.
+
+        Returns:
+            pygame.Rect: The area covered by the element.
+        """
+        return self.rect.copy()
+
     def draw(self, screen):
         raise NotImplemented("Not implemented here.")
 
@@ -219,6 +228,9 @@ class CreditsText:
         for text in self.texts:
             text.draw(screen)
 
+    def bounds(self):
+        return self.texts[0].rect.unionall([text.rect for text in self.texts[1:]])
+
     def position_in_element(self, position):
         for text in self.texts:
             if text.position_in_element(position):
@@ -21,6 +21,9 @@ class PantallaGUI:
         self.click = None
         self.all_text = []
 
+        # Areas of the screen that have to be redrawn, the whole screen when it is first shown
+        self.dirty_rects = [self.image.get_rect()]
+
     def events(self, event_list):
         for event in event_list:
             if event.type == MOUSEBUTTONDOWN:
@@ -33,12 +36,47 @@ class PantallaGUI:
                     if element.position_in_element(event.pos):
                         if element == self.click:
                             element.activate()
+                            self.invalidate(element.bounds())
+
+    def invalidate(self, rect=None):
+        """
+        Mark an area of the screen to be redrawn on the next frame.
+
+        Args:
+            rect (pygame.Rect, optional): The area that changed. The whole screen if not given.
+        """
+        if rect is None:
+            rect = self.image.get_rect()
+        rect = rect.clip(self.image.get_rect())
+        if not any(dirty.contains(rect) for dirty in self.dirty_rects):
+            self.dirty_rects.append(rect)
 
     def draw(self, screen):
-        screen.blit(self.image, self.image.get_rect())
-        for element in self.elements:
-            element.draw(screen, )
+        """
+        Redraw the areas of the screen that changed since the last frame.
+
+        Returns:
+            List[pygame.Rect]: The areas that were redrawn, empty if the screen did not change.
+        """
+        if not self.dirty_rects:
+            return []
+
+        rects = self.dirty_rects
+        self.dirty_rects = []
+
+        for rect in rects:
+            screen.set_clip(rect)
+            screen.blit(self.image, rect, rect)
+            for element in self.elements:
+                if element.bounds().colliderect(rect):
+                    element.draw(screen)
+        screen.set_clip(None)
+
+        return rects
 
     def translate(self, language):
         for text in self.all_text:
+            # Both the old and the new text have to be redrawn, as they may not have the same size
+            old_bounds = text.bounds()
             text.translate(language)
+            self.invalidate(old_bounds.union(text.bounds()))
@@ -1,5 +1,20 @@
 import math
-from queue import PriorityQueue
+import multiprocessing
+import time
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from heapq import heappop, heappush
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+
+from utils.constants import DOORWAY_WIDTH, PATH_BUDGET, PATH_CACHE_SIZE, PATH_WORKERS, ROOM_SEARCH_BATCH, SQUARE_SIZE
 
 
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
@@ -40,3 +55,1288 @@ def reconstruct_path(came_from, current):
     return nodes[::-1]
 
 
+class PathFinder:
+    """
+    A* search over the flat node indices of a grid.
+
+    The score buffers are allocated once and reused: every search gets a new generation number, and an entry only
+    holds a valid score if its stamp matches the current generation, so no buffer is cleared between searches.
+
+    The search reproduces the original node-based algorithm exactly: moving out of a node costs its weight, the
+    heuristic is the euclidean distance to the goal plus the weight of the node, ties are broken by insertion order
+    and a node that is already queued keeps its original priority.
+
+    Attributes:
+        grid (Grid): The grid whose adjacency table and weights are searched.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize a PathFinder object.
+
+        Args:
+            grid (Grid): The grid whose adjacency table and weights are searched.
+        """
+        self.grid = grid
+        self._version = None
+        self._generation = 0
+
+        self._neighbors = []
+        self._weights = []
+        self._xs = []
+        self._ys = []
+
+        self._g = array('d')
+        self._g_stamp = array('q')
+        self._open_stamp = array('q')
+        self._parent = array('l')
+
+    def _refresh(self) -> None:
+        """
+        Copy the adjacency table and weights of the grid into Python lists if they changed since the last search.
+        """
+        if self._version == self.grid.version:
+            return
+
+        self._neighbors = [tuple(index for index in row if index >= 0) for row in self.grid.adjacency.tolist()]
+        self._weights = self.grid.weights.ravel().tolist()
+        # The centres of the squares, computed as Square does so that the snapshots of the grid need no squares
+        rows, cols = np.divmod(np.arange(self.grid.size * self.grid.size), self.grid.size)
+        self._xs = (rows * self.grid.gap + self.grid.gap * 0.5).tolist()
+        self._ys = (cols * self.grid.gap + self.grid.gap * 0.5).tolist()
+
+        total = len(self._weights)
+        if len(self._g) != total:
+            self._g = array('d', bytes(8 * total))
+            self._g_stamp = array('q', bytes(8 * total))
+            self._open_stamp = array('q', bytes(8 * total))
+            self._parent = array('l', [-1]) * total
+            self._generation = 0
+
+        self._version = self.grid.version
+
+    def search(self, start: int, end: int) -> List[int]:
+        """
+        Find the path between two nodes.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+
+        Returns:
+            List[int]: The flat indices of the nodes of the path, from start to end, or an empty list if the end
+                cannot be reached.
+        """
+        self._refresh()
+        self._generation += 1
+        generation = self._generation
+
+        neighbors, weights, xs, ys = self._neighbors, self._weights, self._xs, self._ys
+        g, g_stamp, open_stamp, parent = self._g, self._g_stamp, self._open_stamp, self._parent
+        end_x, end_y = xs[end], ys[end]
+        sqrt = math.sqrt
+
+        count = 0
+        open_set = [(0, count, start)]
+        g[start] = 0
+        g_stamp[start] = generation
+        open_stamp[start] = generation
+
+        while open_set:
+            current = heappop(open_set)[2]
+            open_stamp[current] = 0
+
+            if current == end:
+                return self._reconstruct_path(start, end)
+
+            temp_g_score = g[current] + weights[current]
+            for neighbor in neighbors[current]:
+                if g_stamp[neighbor] != generation or temp_g_score < g[neighbor]:
+                    parent[neighbor] = current
+                    g[neighbor] = temp_g_score
+                    g_stamp[neighbor] = generation
+                    if open_stamp[neighbor] != generation:
+                        count += 1
+                        h_score = sqrt((xs[neighbor] - end_x) ** 2 + (ys[neighbor] - end_y) ** 2) + weights[neighbor]
+                        heappush(open_set, (temp_g_score + h_score, count, neighbor))
+                        open_stamp[neighbor] = generation
+
+        return []
+
+    def _reconstruct_path(self, start: int, end: int) -> List[int]:
+        """
+        Follow the predecessors found by the last search from the end back to the start.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+
+        Returns:
+            List[int]: The flat indices of the nodes of the path, from start to end.
+        """
+        nodes = [end]
+        current = end
+        while current != start:
+            current = self._parent[current]
+            nodes.append(current)
+        return nodes[::-1]
+
+
+def step_costs(grid) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    List every move between neighbouring nodes of a grid with its cost, which is the length of the step plus the
+    weight of the node that is left.
+
+    Args:
+        grid (Grid): The grid whose adjacency table and weights are read.
+
+    Returns:
+        tuple: The flat indices of the nodes left, the flat indices of the nodes reached and the costs of the moves.
+    """
+    adjacency = grid.adjacency
+    sources, slots = np.nonzero(adjacency >= 0)
+    targets = adjacency[sources, slots]
+    step_lengths = np.hypot(targets // grid.size - sources // grid.size, targets % grid.size - sources % grid.size)
+    return sources, targets, step_lengths * grid.gap + grid.weights.ravel()[sources]
+
+
+def batched_dijkstra(graph: csr_matrix, indices: np.ndarray,
+                     batch: int = ROOM_SEARCH_BATCH) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Search a graph from several nodes, a batch of them per call. SciPy holds the interpreter for the whole of a
+    search, so short calls let the main loop run while the rooms of a level are extracted on the loader thread.
+
+    Args:
+        graph (csr_matrix): The directed graph searched.
+        indices (np.ndarray): The nodes searched from.
+        batch (int, optional): The number of nodes searched from per call. Defaults to ROOM_SEARCH_BATCH.
+
+    Returns:
+        tuple: The distances and predecessors from each of the nodes, one row per node.
+    """
+    total = graph.shape[0]
+    distances, predecessors = [np.empty((0, total))], [np.empty((0, total), dtype=np.int32)]
+    for first in range(0, len(indices), batch):
+        batch_distances, batch_predecessors = dijkstra(graph, directed=True, indices=indices[first:first + batch],
+                                                       return_predecessors=True)
+        distances.append(batch_distances)
+        predecessors.append(batch_predecessors)
+    return np.concatenate(distances), np.concatenate(predecessors)
+
+
+class FlowField:
+    """
+    Distances from every node of a grid to a target node, and the step each node takes towards it.
+
+    A single Dijkstra search from the target answers where to go next from any node, so any number of enemies can
+    chase the same target by looking up their next step. The field is only computed again when the target or the
+    grid change.
+
+    Moving out of a node costs the length of the step plus the weight of the node, so paths keep away from walls
+    like those of the A* search.
+
+    Attributes:
+        grid (Grid): The grid whose adjacency table and weights are searched.
+        target (int): The flat index of the node the field leads to, or None before the first search.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize a FlowField object.
+
+        Args:
+            grid (Grid): The grid whose adjacency table and weights are searched.
+        """
+        self.grid = grid
+        self.target = None
+        self._version = None
+        self._field_version = None
+
+        self._graph = None
+        self._distances = np.empty(0)
+        self._next_steps = []
+
+    def _refresh(self) -> None:
+        """
+        Build the graph of the grid, with its edges reversed so that searching from the target gives the distances
+        to it, if the grid changed since it was last built.
+        """
+        if self._version == self.grid.version:
+            return
+
+        total = len(self.grid.adjacency)
+        sources, targets, costs = step_costs(self.grid)
+        self._graph = csr_matrix((costs, (targets, sources)), shape=(total, total))
+
+        self._version = self.grid.version
+
+    def update(self, target: int) -> None:
+        """
+        Compute the field towards a node, unless it is already up to date.
+
+        Args:
+            target (int): The flat index of the node the field leads to.
+        """
+        self._refresh()
+        if self.target == target and self._field_version == self._version:
+            return
+
+        # On the reversed graph, the predecessor of a node is the node it steps to on its cheapest path to the target
+        distances, next_steps = dijkstra(self._graph, directed=True, indices=target, return_predecessors=True)
+
+        # The target and the nodes that cannot reach it stay where they are
+        next_steps = np.where(next_steps < 0, np.arange(len(next_steps)), next_steps)
+
+        self.target = target
+        self._field_version = self._version
+        self._distances = distances
+        self._next_steps = next_steps.tolist()
+
+    def next_step(self, start: int, target: int) -> int:
+        """
+        Get the node to move to from a node in order to reach the target.
+
+        Args:
+            start (int): The flat index of the current node.
+            target (int): The flat index of the node to reach.
+
+        Returns:
+            int: The flat index of the next node, which is the start node itself if it is the target or the target
+                cannot be reached.
+        """
+        self.update(target)
+        return self._next_steps[start]
+
+    def search(self, start: int, target: int) -> List[int]:
+        """
+        Follow the field from a node all the way to the target.
+
+        Args:
+            start (int): The flat index of the start node.
+            target (int): The flat index of the node to reach.
+
+        Returns:
+            List[int]: The flat indices of the nodes of the path, from start to end, or an empty list if the target
+                cannot be reached.
+        """
+        self.update(target)
+        if not np.isfinite(self._distances[start]):
+            return []
+
+        next_steps = self._next_steps
+        nodes = [start]
+        while nodes[-1] != target:
+            nodes.append(next_steps[nodes[-1]])
+        return nodes
+
+
+class RoomGraph:
+    """
+    Hierarchical pathfinding over the rooms of a grid.
+
+    A room is a connected group of walkable nodes that share a zone ID. Where two rooms meet, the border is split
+    into doorways no wider than DOORWAY_WIDTH, each crossed through a pair of portal nodes, one on each side. The
+    paths from every portal to the rest of its room, and the routes between every pair of portals, are computed
+    when the rooms are extracted. A query between two rooms then only takes a local search at each end, and its
+    path joins the stored ones.
+
+    The paths cost the same as those of the flow field, and they are close to the shortest ones but not always
+    equal to them, as doorways are only crossed through their portals. Queries within a single room, or starting or
+    ending on a barrier, are answered by the A* search of the grid.
+
+    Attributes:
+        grid (Grid): The grid whose rooms are searched.
+        rooms (np.ndarray): The room of every node, or -1 for barriers.
+    """
+
+    def __init__(self, grid):
+        """
+        Initialize a RoomGraph object.
+
+        Args:
+            grid (Grid): The grid whose rooms are searched.
+        """
+        self.grid = grid
+        self.rooms = np.empty(0, dtype=np.int32)
+        self._version = None
+
+        self._local = np.empty(0, dtype=np.int32)
+        self._room_nodes: List[np.ndarray] = []
+        self._room_graphs = []
+        self._reversed_room_graphs = []
+        self._room_portals: List[List[int]] = []
+
+        self._links: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._portal_trees = {}
+        self._portals = np.empty(0, dtype=np.int32)
+        self._portal_numbers = np.empty(0, dtype=np.int32)
+        self._portal_distances = np.empty((0, 0))
+        self._portal_predecessors = np.empty((0, 0), dtype=np.int32)
+
+    @classmethod
+    def from_level(cls, compiled_level, gap: int = SQUARE_SIZE) -> 'RoomGraph':
+        """
+        Extract the rooms of a compiled level before its grid is built. Only the arrays of the level are read, so this
+        can run on a loader thread; the grid built from the level then adopts the rooms with attach().
+
+        Args:
+            compiled_level (CompiledLevel): The compiled data of the level.
+            gap (int, optional): The size of a square in pixels. Defaults to SQUARE_SIZE.
+
+        Returns:
+            RoomGraph: The rooms of the level, not yet attached to a grid.
+        """
+        room_graph = cls(SimpleNamespace(
+            size=compiled_level.size, gap=gap, version=0, barriers=compiled_level.barriers,
+            zones=compiled_level.zones, weights=compiled_level.weights, adjacency=compiled_level.adjacency))
+        room_graph.refresh()
+        return room_graph
+
+    def attach(self, grid) -> None:
+        """
+        Search the rooms on a grid built from the same arrays they were extracted from.
+
+        Args:
+            grid (Grid): The grid whose rooms are searched.
+        """
+        self.grid = grid
+        self._version = grid.version
+
+    # ####################################################################### #
+    #                                EXTRACTION                               #
+    # ####################################################################### #
+
+    def refresh(self) -> None:
+        """
+        Extract the rooms and portals of the grid and the paths between portals, if the grid changed since they were
+        last extracted.
+        """
+        if self._version == self.grid.version:
+            return
+
+        total = self.grid.size * self.grid.size
+        walkable = ~self.grid.barriers.ravel()
+        zones = self.grid.zones.ravel()
+        sources, targets, costs = step_costs(self.grid)
+        moves = walkable[sources] & walkable[targets]
+        sources, targets, costs = sources[moves], targets[moves], costs[moves]
+
+        # Rooms are the connected parts of each zone
+        inside = zones[sources] == zones[targets]
+        graph = csr_matrix((np.ones(inside.sum()), (sources[inside], targets[inside])), shape=(total, total))
+        _, labels = connected_components(graph, directed=False)
+        walkable_nodes = np.flatnonzero(walkable)
+        _, rooms = np.unique(labels[walkable_nodes], return_inverse=True)
+        self.rooms = np.full(total, -1, dtype=np.int32)
+        self.rooms[walkable_nodes] = rooms
+
+        order = np.argsort(rooms, kind='stable')
+        starts = np.searchsorted(rooms[order], np.arange(rooms.max() + 1 if rooms.size else 0))
+        self._room_nodes = np.split(walkable_nodes[order], starts[1:]) if rooms.size else []
+        self._local = np.full(total, -1, dtype=np.int32)
+        for nodes in self._room_nodes:
+            self._local[nodes] = np.arange(len(nodes), dtype=np.int32)
+
+        # The moves within each room, over the local indices of its nodes
+        inside = self.rooms[sources] == self.rooms[targets]
+        self._room_graphs = []
+        for room, nodes in enumerate(self._room_nodes):
+            moves = inside & (self.rooms[sources] == room)
+            self._room_graphs.append(csr_matrix(
+                (costs[moves], (self._local[sources[moves]], self._local[targets[moves]])),
+                shape=(len(nodes), len(nodes))))
+        self._reversed_room_graphs = [graph.T.tocsr() for graph in self._room_graphs]
+
+        self._links = []
+        self._find_portals(sources[~inside], targets[~inside], costs[~inside])
+        self._connect_portals()
+        self._route_portals()
+
+        self._version = self.grid.version
+
+    def _find_portals(self, sources: np.ndarray, targets: np.ndarray, costs: np.ndarray) -> None:
+        """
+        Pick a pair of portals for every doorway between two rooms and link them.
+
+        Args:
+            sources (np.ndarray): The nodes left by the moves between rooms.
+            targets (np.ndarray): The nodes reached by the moves between rooms.
+            costs (np.ndarray): The costs of the moves between rooms.
+        """
+        self._room_portals = [[] for _ in self._room_nodes]
+        cost_of = dict(zip(zip(sources.tolist(), targets.tolist()), costs.tolist()))
+        rooms = self.rooms.tolist()
+
+        borders = {}
+        for source, target in zip(sources.tolist(), targets.tolist()):
+            borders.setdefault((rooms[source], rooms[target]), {}).setdefault(source, target)
+
+        links = []
+        for (room, other_room), crossings in borders.items():
+            if room > other_room:
+                continue  # Each border is handled once, from the room with the lowest number
+
+            for doorway in self._split_border(sorted(crossings)):
+                # The portal is the node of the doorway closest to its middle
+                middle = np.mean([divmod(node, self.grid.size) for node in doorway], axis=0)
+                portal = min(doorway, key=lambda node: math.dist(divmod(node, self.grid.size), middle))
+                other_portal = crossings[portal]
+
+                self._room_portals[room].append(portal)
+                self._room_portals[other_room].append(other_portal)
+                links.append((portal, other_portal, cost_of[(portal, other_portal)]))
+                links.append((other_portal, portal, cost_of[(other_portal, portal)]))
+
+        # A node beside several doorways is the portal of all of them
+        self._room_portals = [list(dict.fromkeys(portals)) for portals in self._room_portals]
+
+        if links:
+            link_sources, link_targets, link_costs = zip(*links)
+            self._links.append((np.array(link_sources), np.array(link_targets), np.array(link_costs)))
+
+    def _split_border(self, border: List[int]) -> List[List[int]]:
+        """
+        Split the nodes of a room along the border with another room into doorways no wider than DOORWAY_WIDTH.
+
+        Args:
+            border (List[int]): The flat indices of the nodes of the room next to the other room.
+
+        Returns:
+            List[List[int]]: The nodes of each doorway.
+        """
+        members = set(border)
+
+        def hops_from(first):
+            hops = {first: 0}
+            pending = [first]
+            for node in pending:
+                for neighbour in self.grid.adjacency[node].tolist():
+                    if neighbour in members and neighbour not in hops:
+                        hops[neighbour] = hops[node] + 1
+                        pending.append(neighbour)
+            return hops
+
+        doorways = []
+        while members:
+            # Each separate part of the border is measured from one of its ends, the node farthest from any other
+            start_hops = hops_from(min(members))
+            hops = hops_from(max(start_hops, key=lambda node: (start_hops[node], -node)))
+
+            stretches = {}
+            for node in sorted(hops):
+                stretches.setdefault(hops[node] // DOORWAY_WIDTH, []).append(node)
+            doorways.extend(stretches[key] for key in sorted(stretches))
+            members -= set(hops)
+
+        return doorways
+
+    def _connect_portals(self) -> None:
+        """
+        Compute the paths from every portal to the rest of its room and link the portals of each room.
+        """
+        self._portal_trees = {}
+        for room, portals in enumerate(self._room_portals):
+            if not portals:
+                continue
+
+            local_portals = self._local[portals]
+            distances, predecessors = batched_dijkstra(self._room_graphs[room], local_portals)
+            for portal, portal_predecessors in zip(portals, predecessors):
+                self._portal_trees[portal] = portal_predecessors
+
+            # Every portal of the room leads to the others through it
+            distances = distances[:, local_portals]
+            rows, cols = np.nonzero(np.isfinite(distances) & ~np.eye(len(portals), dtype=bool))
+            portals = np.array(portals)
+            self._links.append((portals[rows], portals[cols], distances[rows, cols]))
+
+    def _route_portals(self) -> None:
+        """
+        Compute the cheapest routes between every pair of portals over their links.
+        """
+        self._portals = np.array([portal for portals in self._room_portals for portal in portals], dtype=np.int32)
+        self._portal_numbers = np.full(self.grid.size * self.grid.size, -1, dtype=np.int32)
+        self._portal_numbers[self._portals] = np.arange(len(self._portals), dtype=np.int32)
+        total = len(self._portals)
+
+        # A single room, or rooms without doorways between them, have no portals to route between
+        if not self._links:
+            self._portal_distances = np.empty((0, 0))
+            self._portal_predecessors = np.empty((0, 0), dtype=np.int32)
+            return
+
+        sources, targets, costs = (np.concatenate(values) for values in zip(*self._links))
+        sources, targets = self._portal_numbers[sources], self._portal_numbers[targets]
+
+        # Only the cheapest link between two portals is kept, as the graph would add them up
+        keys = sources.astype(np.int64) * total + targets
+        order = np.lexsort((costs, keys))
+        _, first = np.unique(keys[order], return_index=True)
+        cheapest = order[first]
+
+        graph = csr_matrix((costs[cheapest], (sources[cheapest], targets[cheapest])), shape=(total, total))
+        self._portal_distances, self._portal_predecessors = batched_dijkstra(graph, np.arange(total))
+
+    # ####################################################################### #
+    #                                  SEARCH                                 #
+    # ####################################################################### #
+
+    def search(self, start: int, end: int) -> List[int]:
+        """
+        Find a path between two nodes.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+
+        Returns:
+            List[int]: The flat indices of the nodes of the path, from start to end, or an empty list if the end
+                cannot be reached.
+        """
+        self.refresh()
+        start_room, end_room = self.rooms[start], self.rooms[end]
+        if start_room < 0 or end_room < 0 or start_room == end_room:
+            return self.grid.path_finder.search(start, end)
+
+        start_portals = self._room_portals[start_room]
+        end_portals = self._room_portals[end_room]
+        if not start_portals or not end_portals:
+            return []
+
+        # Local searches from the start to the portals of its room, and from the portals of the last room to the end
+        start_distances, start_predecessors = dijkstra(self._room_graphs[start_room], directed=True,
+                                                       indices=self._local[start], return_predecessors=True)
+        end_distances, end_successors = dijkstra(self._reversed_room_graphs[end_room], directed=True,
+                                                 indices=self._local[end], return_predecessors=True)
+
+        # The cheapest combination of a portal to leave the first room, a route and a portal to enter the last room
+        first_numbers = self._portal_numbers[start_portals]
+        last_numbers = self._portal_numbers[end_portals]
+        totals = (start_distances[self._local[start_portals]][:, np.newaxis]
+                  + self._portal_distances[np.ix_(first_numbers, last_numbers)]
+                  + end_distances[self._local[end_portals]][np.newaxis, :])
+        first, last = np.unravel_index(np.argmin(totals), totals.shape)
+        if not np.isfinite(totals[first, last]):
+            return []
+
+        route = [last_numbers[last]]
+        while route[-1] != first_numbers[first]:
+            route.append(self._portal_predecessors[first_numbers[first], route[-1]])
+        portals = self._portals[route[::-1]].tolist()
+
+        return self._refine(start, end, portals, start_predecessors, end_successors)
+
+    def _refine(self, start: int, end: int, portals: List[int], start_predecessors: np.ndarray,
+                end_successors: np.ndarray) -> List[int]:
+        """
+        Join the paths between the nodes of a route over the portals.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+            portals (List[int]): The portals crossed, in order.
+            start_predecessors (np.ndarray): The predecessors found by the search from the start.
+            end_successors (np.ndarray): The successors found by the search towards the end.
+
+        Returns:
+            List[int]: The flat indices of the nodes of the path, from start to end.
+        """
+        path = self._walk_back(start_predecessors, start, portals[0])
+
+        for portal, next_portal in zip(portals, portals[1:]):
+            if self.rooms[portal] == self.rooms[next_portal]:
+                path.extend(self._walk_back(self._portal_trees[portal], portal, next_portal)[1:])
+            else:
+                path.append(next_portal)
+
+        path.extend(self._walk_back(end_successors, end, portals[-1])[-2::-1])
+        return path
+
+    def _walk_back(self, predecessors: np.ndarray, source: int, node: int) -> List[int]:
+        """
+        Follow the predecessors found by a search within a room from a node back to where the search started.
+
+        Args:
+            predecessors (np.ndarray): The local predecessors found by the search.
+            source (int): The flat index of the node the search started from.
+            node (int): The flat index of the node to walk back from.
+
+        Returns:
+            List[int]: The flat indices of the nodes of the path, from the source to the node.
+        """
+        local_source = self._local[source]
+        current = self._local[node]
+        path = [current]
+        while current != local_source:
+            current = predecessors[current]
+            path.append(current)
+        return self._room_nodes[self.rooms[source]][path[::-1]].tolist()
+
+
+class GridSnapshot:
+    """
+    Read-only view of the arrays of a grid searched for paths, kept in shared memory so that worker processes can
+    search paths without receiving a copy of the grid.
+
+    The snapshot only holds what the path searches read, so it takes the place of the grid for its own PathFinder
+    and RoomGraph.
+
+    Attributes:
+        description (dict): The size, gap and version of the grid and the shared memory block, shape and data type
+            of each of its arrays.
+        path_finder (PathFinder): The A* search over the snapshot.
+        room_graph (RoomGraph): The room graph of the snapshot.
+    """
+
+    arrays = ('barriers', 'zones', 'weights', 'adjacency')
+
+    def __init__(self, description: dict):
+        """
+        Initialize a GridSnapshot object, attached to the shared memory blocks of a grid.
+
+        Args:
+            description (dict): The description of the shared arrays, as returned by share_grid().
+        """
+        self.description = description
+        self.size = description['size']
+        self.gap = description['gap']
+        self.version = description['version']
+
+        blocks = []
+        for name, (block_name, shape, dtype) in description['arrays'].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            array.flags.writeable = False
+            setattr(self, name, array)
+            blocks.append(block)
+        self._blocks = blocks
+
+        self.path_finder = PathFinder(self)
+        self.room_graph = RoomGraph(self)
+
+    def close(self) -> None:
+        """
+        Detach the snapshot from the shared memory blocks.
+        """
+        for name in self.arrays:
+            setattr(self, name, None)  # The arrays must let go of the memory before it is closed
+        for block in self._blocks:
+            block.close()
+        self._blocks = []
+
+
+def share_grid(grid) -> Tuple[dict, List[shared_memory.SharedMemory]]:
+    """
+    Copy the arrays of a grid searched for paths into new shared memory blocks.
+
+    Args:
+        grid (Grid): The grid to share.
+
+    Returns:
+        tuple: The description of the shared arrays, from which a GridSnapshot is attached, and the blocks, which
+            must be released with release_blocks() once no snapshot reads them.
+    """
+    arrays = {}
+    blocks = []
+    for name in GridSnapshot.arrays:
+        values = getattr(grid, name)
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+        arrays[name] = (block.name, values.shape, values.dtype.str)
+        blocks.append(block)
+
+    return {'size': grid.size, 'gap': grid.gap, 'version': grid.version, 'arrays': arrays}, blocks
+
+
+def release_blocks(blocks: List[shared_memory.SharedMemory]) -> None:
+    """
+    Free shared memory blocks created by share_grid().
+
+    Args:
+        blocks (List[shared_memory.SharedMemory]): The blocks to free.
+    """
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+_worker_snapshot = None  # The snapshot last searched by a worker process, kept for its following searches
+
+
+def search_snapshot(description: dict, start: int, end: int) -> List[int]:
+    """
+    Find a path between two nodes over a shared grid, from a worker process.
+
+    Args:
+        description (dict): The description of the shared arrays, as returned by share_grid().
+        start (int): The flat index of the start node.
+        end (int): The flat index of the end node.
+
+    Returns:
+        List[int]: The flat indices of the nodes of the path, from start to end, or an empty list if the end
+            cannot be reached.
+    """
+    global _worker_snapshot
+    if _worker_snapshot is None or _worker_snapshot.description != description:
+        if _worker_snapshot is not None:
+            _worker_snapshot.close()
+        _worker_snapshot = GridSnapshot(description)
+
+    return _worker_snapshot.room_graph.search(start, end)
+
+
+class PathScheduler:
+    """
+    Queue of path requests, answered over the frames within a time budget or by a pool of worker processes.
+
+    Every request gets a future that holds the path once it is found. Identical requests made before they are
+    answered share the same future, so the path it holds must not be changed, and its search is only dropped once
+    every one of them is withdrawn.
+
+    Without workers, the requests are answered on the main loop in the order they were made, as many on every frame
+    as fit in the budget, and at least one so that the queue always moves. With workers, every request is sent to
+    the pool as soon as it is made, and the workers search a snapshot of the grid in shared memory, which is taken
+    again whenever the grid changes.
+
+    Attributes:
+        grid (Grid): The grid whose paths are searched.
+        budget (float): The milliseconds spent on searches on every frame without workers.
+        workers (int): The number of worker processes, or 0 to search on the main loop.
+    """
+
+    _pool = None  # Shared by the schedulers of every level, so the worker processes only start once
+    _schedulers = weakref.WeakSet()  # The schedulers alive, whose snapshots are freed when the pool shuts down
+
+    def __init__(self, grid, budget: float = PATH_BUDGET, workers: int = PATH_WORKERS):
+        """
+        Initialize a PathScheduler object.
+
+        Args:
+            grid (Grid): The grid whose paths are searched.
+            budget (float, optional): The milliseconds spent on searches on every frame without workers. Defaults to
+                PATH_BUDGET.
+            workers (int, optional): The number of worker processes, or 0 to search on the main loop. Defaults to
+                PATH_WORKERS.
+        """
+        self.grid = grid
+        self.budget = budget
+        self.workers = workers
+        self._requests: Dict[Tuple[int, int], Future] = {}
+        self._requesters: Dict[Tuple[int, int], int] = {}  # The number of requests sharing each future
+
+        self._description = None
+        self._release = None
+        self._retired = []  # Releases of earlier snapshots, delayed until the searches sent with them are over
+        PathScheduler._schedulers.add(self)
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def request(self, start: int, end: int) -> Future:
+        """
+        Queue the search of a path between two nodes.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+
+        Returns:
+            Future: The future holding the flat indices of the nodes of the path once it is found, or an empty list
+                if the end cannot be reached.
+        """
+        key = (start, end)
+        future = self._requests.get(key)
+        if future is None:
+            if self.workers:
+                future = self._executor().submit(search_snapshot, self._share(), start, end)
+            else:
+                future = Future()
+            self._requests[key] = future
+        self._requesters[key] = self._requesters.get(key, 0) + 1
+        return future
+
+    def withdraw(self, start: int, end: int, future: Future) -> None:
+        """
+        Withdraw a request that is no longer wanted. Its search is dropped, or cancelled if the workers have not
+        started it, once every request sharing it is withdrawn.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+            future (Future): The future returned by the request.
+        """
+        key = (start, end)
+        if self._requests.get(key) is not future:
+            return  # The request was already answered
+
+        self._requesters[key] -= 1
+        if self._requesters[key] == 0:
+            del self._requesters[key]
+            self._requests.pop(key).cancel()
+
+    def run(self) -> None:
+        """
+        Answer the oldest requests until the budget of the frame is spent, or forget those the workers answered.
+        """
+        if self.workers:
+            self._requests = {key: future for key, future in self._requests.items() if not future.done()}
+            self._requesters = {key: self._requesters[key] for key in self._requests}
+            if not self._requests:
+                for release in self._retired:
+                    release()
+                self._retired = []
+            return
+
+        deadline = time.perf_counter() + self.budget / 1000
+        while self._requests:
+            start, end = key = next(iter(self._requests))
+            del self._requesters[key]
+            self._requests.pop(key).set_result(self.grid.room_graph.search(start, end))
+
+            if time.perf_counter() >= deadline:
+                break
+
+    def release(self) -> None:
+        """
+        Cancel the pending requests and free every snapshot of the grid in shared memory, once the grid is left.
+        """
+        for future in self._requests.values():
+            future.cancel()
+        self._requests = {}
+        self._requesters = {}
+
+        for release in self._retired:
+            release()
+        self._retired = []
+        if self._release is not None:
+            self._release()
+        self._description, self._release = None, None
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Release every scheduler and stop the pool of worker processes, if it was started.
+        """
+        for scheduler in list(cls._schedulers):
+            scheduler.release()
+
+        if cls._pool is not None:
+            cls._pool.shutdown(wait=True, cancel_futures=True)
+            cls._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """
+        Get the pool of worker processes, starting it on the first request.
+
+        Returns:
+            ProcessPoolExecutor: The pool of worker processes.
+        """
+        if PathScheduler._pool is None:
+            # New processes are spawned rather than forked, as they have no use for the display or the audio
+            PathScheduler._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return PathScheduler._pool
+
+    def _share(self) -> dict:
+        """
+        Take a snapshot of the grid in shared memory if it changed since the last one.
+
+        Returns:
+            dict: The description of the shared arrays of the grid.
+        """
+        if self._description is None or self._description['version'] != self.grid.version:
+            if self._release is not None:
+                self._retired.append(self._release)
+            self._description, blocks = share_grid(self.grid)
+            # The blocks are freed along with the scheduler, or at exit
+            self._release = weakref.finalize(self, release_blocks, blocks)
+        return self._description
+
+
+class PathCache:
+    """
+    Least recently used cache of the smoothed paths of the enemies, emptied whenever the grid changes.
+
+    The paths are kept by their start and end nodes and the number of points they were smoothed with. They are
+    shared by every lookup, so they must not be changed.
+
+    Attributes:
+        grid (Grid): The grid whose paths are kept.
+        capacity (int): The largest number of paths kept.
+        hits (int): The number of lookups that found a path.
+        misses (int): The number of lookups that did not.
+    """
+
+    def __init__(self, grid, capacity: int = PATH_CACHE_SIZE):
+        """
+        Initialize a PathCache object.
+
+        Args:
+            grid (Grid): The grid whose paths are kept.
+            capacity (int, optional): The largest number of paths kept. Defaults to PATH_CACHE_SIZE.
+        """
+        self.grid = grid
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._paths = OrderedDict()  # Least recent first
+        self._version = grid.version
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _refresh(self) -> None:
+        """
+        Forget every path if the grid changed since they were kept.
+        """
+        if self._version != self.grid.version:
+            self._paths.clear()
+            self._version = self.grid.version
+
+    def get(self, start: int, end: int, segments: int):
+        """
+        Look up a path.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+            segments (int): The number of points per square of the path.
+
+        Returns:
+            The path kept, or None if there is none.
+        """
+        self._refresh()
+        path = self._paths.pop((start, end, segments), None)
+        if path is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._paths[(start, end, segments)] = path
+        return path
+
+    def put(self, start: int, end: int, segments: int, path) -> None:
+        """
+        Keep a path, evicting the least recently used one when there are too many.
+
+        Args:
+            start (int): The flat index of the start node.
+            end (int): The flat index of the end node.
+            segments (int): The number of points per square of the path.
+            path: The path to keep.
+        """
+        self._refresh()
+        if self._paths.pop((start, end, segments), None) is None and len(self._paths) >= self.capacity:
+            self._paths.popitem(last=False)
+        self._paths[(start, end, segments)] = path
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                         RAY CASTING                                           #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+def cone_degrees(angles: np.ndarray, cones: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the degrees of the rays of several vision cones, one degree apart and sweeping clockwise.
+
+    Each sweep starts one degree past the left edge of its cone and stops at the first ray past its right edge.
+    Rays that fall exactly on 90 or 270 degrees are moved by 0.001 degrees to avoid vertical tangents, which
+    also shifts every ray after them in the same sweep; the tangent of such a ray is still taken before the shift.
+
+    Args:
+        angles (np.ndarray): The direction each cone is facing, in degrees.
+        cones (np.ndarray): The aperture of each cone, in degrees.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The degrees of the rays of all the cones one after another, the
+            degrees from which their tangents are taken, and the number of rays of each cone.
+    """
+    angles = np.asarray(angles, dtype=float)
+    cones = np.asarray(cones, dtype=float)
+    starts = (angles + (cones / 2 + 1)) % 360
+    ends = (angles - cones / 2) % 360
+
+    # Every step subtracts one degree, which is exact until a sweep wraps around or a ray is shifted, so each
+    # sweep is built in runs that restart from those rays
+    totals = cones.astype(np.intp) + 4
+    columns = np.arange(totals.max() if totals.size else 0)
+    degrees = np.empty((cones.size, columns.size))
+    tangent_degrees = np.empty((cones.size, columns.size))
+    bases = starts.copy()
+    filled = np.zeros(cones.size, dtype=np.intp)
+    pending = np.arange(cones.size)
+    while pending.size:
+        steps = columns - filled[pending, np.newaxis] + 1
+        run = bases[pending, np.newaxis] - steps
+        written = (steps > 0) & (columns < totals[pending, np.newaxis])
+        events = written & ((run < 0) | (run == 90) | (run == 270))
+        has_event = events.any(axis=1)
+        written &= ~has_event[:, np.newaxis] | (columns <= events.argmax(axis=1)[:, np.newaxis])
+
+        rows, written_columns = np.nonzero(written)
+        degrees[pending[rows], written_columns] = tangent_degrees[pending[rows], written_columns] = run[written]
+
+        # Sweeps that wrap around restart from the wrapped ray, shifted sweeps from the shifted one
+        last = events.argmax(axis=1)[has_event]
+        pending = pending[has_event]
+        base = degrees[pending, last]
+        wrapped = base < 0
+        base = np.where(wrapped, base % 360, base + 0.001)
+        degrees[pending, last] = base
+        tangent_degrees[pending[wrapped], last[wrapped]] = base[wrapped]
+        bases[pending] = base
+        filled[pending] = last + 1
+
+    # A sweep goes on while its previous ray is still inside the cone
+    wrapped = degrees % 360
+    starts, ends = starts[:, np.newaxis], ends[:, np.newaxis]
+    inside = np.where(starts <= ends,
+                      (wrapped <= starts) | (wrapped >= ends),
+                      (ends <= wrapped) & (wrapped <= starts))
+    outside = ~inside & (columns < totals[:, np.newaxis])
+    counts = np.where(outside.any(axis=1), outside.argmax(axis=1) + 1, totals)
+
+    rays = columns < counts[:, np.newaxis]
+    return degrees[rays], tangent_degrees[rays], counts
+
+
+def _march(barriers: np.ndarray, gap: int, ray_x: np.ndarray, ray_y: np.ndarray, offset_x: np.ndarray,
+           offset_y: np.ndarray, reaches: np.ndarray, cell_x: int, cell_y: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Step every ray along the grid lines of one axis until it reaches a barrier or runs out of steps.
+
+    Args:
+        barriers (np.ndarray): The barrier flags of the grid.
+        gap (int): The size of each square in pixels.
+        ray_x (np.ndarray): The x-coordinate where each ray crosses the first grid line.
+        ray_y (np.ndarray): The y-coordinate where each ray crosses the first grid line.
+        offset_x (np.ndarray): The x-coordinate added at every step of each ray.
+        offset_y (np.ndarray): The y-coordinate subtracted at every step of each ray.
+        reaches (np.ndarray): The maximum number of steps of each ray.
+        cell_x (int or np.ndarray): Subtracted from the column of each point to get the square it is checked against.
+        cell_y (int or np.ndarray): Subtracted from the row of each point to get the square it is checked against.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The point where each ray stops.
+    """
+    steps = int(reaches.max()) if reaches.size else 0
+    if steps == 0:
+        return ray_x, ray_y
+
+    # Points are accumulated one step at a time, one row per step, to keep the rounding of the coordinates
+    xs = np.empty((steps + 1, ray_x.size))
+    xs[0], xs[1:] = ray_x, offset_x
+    np.add.accumulate(xs, axis=0, out=xs)
+    ys = np.empty((steps + 1, ray_y.size))
+    ys[0], ys[1:] = ray_y, offset_y
+    np.subtract.accumulate(ys, axis=0, out=ys)
+
+    map_x = xs[:steps] // gap - cell_x
+    map_y = ys[:steps] // gap - cell_y
+    size_x, size_y = barriers.shape
+    inside = (map_x >= 0) & (map_x < size_x) & (map_y >= 0) & (map_y < size_y)
+    hits = barriers.ravel().take(np.where(inside, map_x * size_y + map_y, 0).astype(np.intp))
+    hits &= inside
+    if reaches.min() < steps:
+        hits &= np.arange(steps)[:, np.newaxis] < reaches
+
+    # Rays that hit nothing stop after their last step
+    stop = np.where(hits.any(axis=0), hits.argmax(axis=0), reaches)
+    rays = np.arange(ray_x.size)
+    return xs[stop, rays], ys[stop, rays]
+
+
+def cast_rays(barriers: np.ndarray, gap: int, x: np.ndarray, y: np.ndarray, degrees: np.ndarray,
+              tangent_degrees: np.ndarray, reaches: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find where each ray meets a barrier, checking the horizontal and the vertical grid lines it crosses and keeping
+    the closest contact.
+
+    Args:
+        barriers (np.ndarray): The barrier flags of the grid.
+        gap (int): The size of each square in pixels.
+        x (np.ndarray): The x-coordinate of the origin of each ray.
+        y (np.ndarray): The y-coordinate of the origin of each ray.
+        degrees (np.ndarray): The direction of each ray, as returned by cone_degrees.
+        tangent_degrees (np.ndarray): The degrees from which the tangent of each ray is taken.
+        reaches (np.ndarray): The maximum number of grid lines each ray can cross.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The contact point of each ray.
+    """
+    # The tangents are computed one by one since the vectorized tangent can differ in the last bit
+    tangents = np.fromiter(map(math.tan, np.radians(tangent_degrees).tolist()), dtype=float, count=degrees.size)
+    flat = tangents == 0
+    safe_tangents = np.where(flat, 1, tangents)
+
+    # Horizontal grid lines
+    up = degrees <= 180
+    line_y = np.ceil(y / gap) * gap
+    ray_y = np.where(up, line_y - gap, line_y + 0.001)
+    offset_y = np.where(up, gap, -gap).astype(float)
+    ray_x = np.where(flat, x, (y - ray_y) / safe_tangents + x)
+    offset_x = np.where(flat, 0, offset_y / safe_tangents)
+    horizontal_x, horizontal_y = _march(barriers, gap, ray_x, ray_y, offset_x, offset_y, reaches, 0, up)
+
+    # Vertical grid lines
+    right = ~((90 < degrees) & (degrees < 270))
+    line_x = np.ceil(x / gap) * gap
+    ray_x = np.where(right, line_x + 0.001, line_x - gap)
+    offset_x = np.where(right, gap, -gap).astype(float)
+    ray_y = np.where(flat, y, (x - ray_x) * safe_tangents + y)
+    offset_y = np.where(flat, 0, offset_x * safe_tangents)
+    vertical_x, vertical_y = _march(barriers, gap, ray_x, ray_y, offset_x, offset_y, reaches, ~right, 0)
+
+    horizontal_distance = np.sqrt((horizontal_x - x) * (horizontal_x - x) + (horizontal_y - y) * (horizontal_y - y))
+    vertical_distance = np.sqrt((vertical_x - x) * (vertical_x - x) + (vertical_y - y) * (vertical_y - y))
+    vertical = vertical_distance < horizontal_distance
+
+    return np.where(vertical, vertical_x, horizontal_x), np.where(vertical, vertical_y, horizontal_y)
+
+
+def contact_corners(x: list, y: list, contact_x: np.ndarray, contact_y: np.ndarray,
+                    counts: np.ndarray) -> List[List[tuple]]:
+    """
+    Build the edges of several visibility polygons from the contact points of their rays, skipping the contacts
+    that share a coordinate with the previous one of the same cone.
+
+    Args:
+        x (list): The x-coordinate of the origin of each cone.
+        y (list): The y-coordinate of the origin of each cone.
+        contact_x (np.ndarray): The x-coordinate of the contact point of each ray, cone after cone.
+        contact_y (np.ndarray): The y-coordinate of the contact point of each ray, cone after cone.
+        counts (np.ndarray): The number of rays of each cone.
+
+    Returns:
+        List[List[tuple]]: The pairs of points of each polygon, starting and ending at the origin of its cone.
+    """
+    points = list(zip(contact_x.tolist(), contact_y.tolist()))
+    ends = np.cumsum(counts).tolist()
+    starts = [0] + ends[:-1]
+
+    # Contacts that differ in both coordinates from the previous one open a new edge
+    corners = ((contact_x[1:] != contact_x[:-1]) & (contact_y[1:] != contact_y[:-1])).nonzero()[0] + 1
+    bounds = np.searchsorted(corners, ends[:-1] + [len(points)]).tolist()
+    corners = corners.tolist()
+
+    polygons = []
+    first_corner = 0
+    for origin_x, origin_y, start, end, last_corner in zip(x, y, starts, ends, bounds):
+        origin = (origin_x, origin_y)
+        corner_list = [(origin, points[start])]
+        corner_list.extend([(points[index - 1], points[index]) for index in corners[first_corner:last_corner]
+                            if index != start])
+        corner_list.append((points[end - 1], origin))
+        polygons.append(corner_list)
+        first_corner = last_corner
+    return polygons
+
+
+def cast_cones(barriers: np.ndarray, gap: int, x: list, y: list, angles: list, cones: list,
+               reaches: list) -> List[List[tuple]]:
+    """
+    Compute the visibility polygons of several vision cones at once.
+
+    Args:
+        barriers (np.ndarray): The barrier flags of the grid.
+        gap (int): The size of each square in pixels.
+        x (list): The x-coordinate of the origin of each cone.
+        y (list): The y-coordinate of the origin of each cone.
+        angles (list): The direction each cone is facing, in degrees.
+        cones (list): The aperture of each cone, in degrees.
+        reaches (list): The maximum number of grid lines the rays of each cone can cross.
+
+    Returns:
+        List[List[tuple]]: The pairs of points of each polygon, starting and ending at the origin of its cone.
+    """
+    if not x:
+        return []
+
+    degrees, tangent_degrees, counts = cone_degrees(angles, cones)
+    steps = np.ceil(np.minimum(reaches, barriers.shape[0])).astype(np.intp)
+    contact_x, contact_y = cast_rays(barriers, gap, np.repeat(np.asarray(x, dtype=float), counts),
+                                     np.repeat(np.asarray(y, dtype=float), counts), degrees, tangent_degrees,
+                                     np.repeat(steps, counts))
+    return contact_corners(x, y, contact_x, contact_y, counts)
+
+
+def cast_cone(barriers: np.ndarray, gap: int, x: float, y: float, angle: float, cone: float,
+              reach: int) -> List[tuple]:
+    """
+    Compute the visibility polygon of a vision cone.
+
+    Args:
+        barriers (np.ndarray): The barrier flags of the grid.
+        gap (int): The size of each square in pixels.
+        x (float): The x-coordinate of the origin of the cone.
+        y (float): The y-coordinate of the origin of the cone.
+        angle (float): The direction the cone is facing, in degrees.
+        cone (float): The aperture of the cone, in degrees.
+        reach (int): The maximum number of grid lines each ray can cross.
+
+    Returns:
+        List[tuple]: The pairs of points of the polygon, starting and ending at the origin.
+    """
+    return cast_cones(barriers, gap, [x], [y], [angle], [cone], [reach])[0]
+
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                          DETECTION                                            #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+def polygon_bounds(corners: List[tuple]) -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+    """
+    Collect the vertices of a visibility polygon and its bounding box.
+
+    Args:
+        corners (List[tuple]): The pairs of points of the polygon, as returned by cast_cone.
+
+    Returns:
+        Tuple[np.ndarray, Tuple[float, float, float, float]]: The vertices of the polygon, one per row, and its
+            left, top, right and bottom bounds.
+    """
+    vertices = np.array(corners, dtype=float).reshape(-1, 2)
+    left, top = vertices.min(axis=0).tolist()
+    right, bottom = vertices.max(axis=0).tolist()
+    return vertices, (left, top, right, bottom)
+
+
+def polygon_hits_rect(vertices: np.ndarray, left: float, top: float, right: float, bottom: float) -> bool:
+    """
+    Check whether a polygon overlaps an axis-aligned rectangle.
+
+    The polygon overlaps the rectangle if any of its edges crosses the rectangle, or if the rectangle lies
+    completely inside it, which is checked with the even-odd rule on one of the corners of the rectangle.
+
+    Args:
+        vertices (np.ndarray): The vertices of the polygon, one per row.
+        left (float): The left bound of the rectangle.
+        top (float): The top bound of the rectangle.
+        right (float): The right bound of the rectangle.
+        bottom (float): The bottom bound of the rectangle.
+
+    Returns:
+        bool: True if the polygon and the rectangle overlap, False otherwise.
+    """
+    start_x, start_y = vertices[:, 0], vertices[:, 1]
+    end_x, end_y = np.roll(start_x, -1), np.roll(start_y, -1)
+    delta_x, delta_y = end_x - start_x, end_y - start_y
+
+    # Clip every edge against the rectangle (Liang-Barsky), one side at a time
+    entering = np.zeros(start_x.size)
+    leaving = np.ones(start_x.size)
+    crosses = np.ones(start_x.size, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for direction, distance in ((-delta_x, start_x - left), (delta_x, right - start_x),
+                                    (-delta_y, start_y - top), (delta_y, bottom - start_y)):
+            ratio = distance / direction
+            entering = np.where(direction < 0, np.maximum(entering, ratio), entering)
+            leaving = np.where(direction > 0, np.minimum(leaving, ratio), leaving)
+            crosses &= (direction != 0) | (distance >= 0)
+    if (crosses & (entering <= leaving)).any():
+        return True
+
+    # No edge reaches the rectangle, so it is either completely inside or completely outside
+    straddles = (start_y > top) != (end_y > top)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing_x = start_x + (top - start_y) * delta_x / delta_y
+    return bool(np.count_nonzero(straddles & (left < crossing_x)) % 2)
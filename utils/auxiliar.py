@@ -100,6 +100,29 @@ def fill_mask(surface, mask):
     surface.blit(result_surface, (0, 0))
 
 
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                        DRAWING FUNCTIONS                                      #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+
+def blit_all(surface, commands):
+    """
+    Blit a sequence of images on a surface with a single call.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        commands (list): The (image, position) pairs to blit, in drawing order.
+    """
+    if not commands:
+        return
+
+    # fblits is only provided by pygame-ce, and skips building the list of changed areas
+    fblits = getattr(surface, 'fblits', None)
+    if fblits is not None:
+        fblits(commands)
+    else:
+        surface.blits(commands, doreturn=False)
+
+
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                     ANGLE TOOLS FUNCTIONS                                     #
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
@@ -14,6 +14,8 @@ REACH_OF_VISION = 5
 
 GRID_BACKGROUND = (0, 0, 0)
 SQUARE_SIZE = 50  # Represents the size of each square in pixels on the grid.
+MAP_SIZE = 100  # Represents the number of squares per side of the grid of every level.
+CHUNK_SIZE = 8  # Represents the number of squares per side of each pre-rendered map chunk.
 MAP = 'game/map/files/mapa_bueno_1_bordes.csv'  # Represents the path to the file containing the map information.
 TILE_MAP = 'game/map/files/mapa_bueno_1_tiles.csv'  # Represents the path to the file containing the tile map information.
 
@@ -29,6 +31,9 @@ TILE_DOOR = [1295, 1296]
 # ####################################################################### #
 
 FPS = 60  # Represents the refresh rate (frames per second) for the loop.
+ZOOM_STEP = 0.1  # Represents the precision to which the camera zoom level is rounded when it is not the default.
+ZOOM_CACHE_SIZE = 4  # Represents the number of zoom steps whose buffers, into which every frame is scaled, are kept.
+LEVEL_BUILD_BUDGET = 3  # Represents the milliseconds spent on building the scene of the next level on every frame.
 
 RED = (255, 0, 0)
 PASTEL_RED = (255, 182, 193)  # This is a pastel shade of red
@@ -42,6 +47,7 @@ PURPLE = (128, 0, 128)
 ORANGE = (255, 165, 0)
 GREY = (200, 200, 200)
 TURQUOISE = (64, 224, 208)
+VISION_SHADOW = (0, 0, 0, 100)  # Represents the color that covers the areas of the screen no enemy can see.
 
 # ####################################################################### #
 #                               MENU CONSTANTS                            #
@@ -70,6 +76,11 @@ FINISHED_GAME_MENU_ID = "finished game menu"
 # ####################################################################### #
 
 WEIGHT = 2
+DOORWAY_WIDTH = 3  # Represents the widest stretch of the border between two rooms crossed through a single portal.
+ROOM_SEARCH_BATCH = 16  # Represents the number of portals searched from at once when the rooms of a level are extracted.
+PATH_BUDGET = 2  # Represents the milliseconds spent on searching the paths requested by enemies on every frame.
+PATH_CACHE_SIZE = 256  # Represents the number of smoothed paths kept for the enemies to set again without searching them.
+PATH_WORKERS = 0  # Represents the number of background processes searching the paths requested by enemies, or 0 to search them on the main loop.
 
 # ####################################################################### #
 #                              PLAYER CONSTANTS                           #
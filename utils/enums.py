@@ -96,3 +96,18 @@ class Controls(Enum):
                 return control
         raise ValueError("Invalid control string")
 
+
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+#                                        FRAME PACING                                           #
+# ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
+class Pacing(Enum):
+    TICK = "tick"  # The loop sleeps until the next frame is due
+    BUSY_LOOP = "busy"  # The loop spins until the next frame is due, more precise but keeps a core busy
+    VSYNC = "vsync"  # The display waits for the vertical blank when presenting
+
+    @staticmethod
+    def from_string(s):
+        for pacing in Pacing:
+            if s == pacing.value:
+                return pacing
+        raise ValueError("Invalid pacing string")
@@ -1,7 +1,7 @@
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                        PATHS TO FOLDERS                                       #
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
-from game.sprites.spritesheet import SpriteSheet
+from managers.resource_manager import ResourceManager
 
 MENU_ASSETS = "assets/menu_assets/"
 
@@ -59,7 +59,7 @@ FONT = FONT_PATH + 'pixel-tactical.ttf'
 #                                        PATH TO GUI BUTTONS                                    #
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 
-buttons = SpriteSheet(MENU_ASSETS + 'ui_white.png', 10, 9, 80)
+buttons = ResourceManager.load_sprite_sheet(MENU_ASSETS + 'ui_white.png', 10, 9, 80)
 
 BUTTON_PLAY = buttons.get_sprite_by_number(85)
 BUTTON_CONFIGURATION = buttons.get_sprite_by_number(75)
@@ -72,7 +72,7 @@ BUTTON_WASD = 'assets/menu_assets/wasd.png'
 SWITCH_ON = buttons.get_sprite_by_number(40)
 SWITCH_OFF = buttons.get_sprite_by_number(42)
 
-flags = SpriteSheet(MENU_ASSETS + 'flags.png', 11, 5, 68)
+flags = ResourceManager.load_sprite_sheet(MENU_ASSETS + 'flags.png', 11, 5, 68)
 
 SPAIN = flags.get_sprite_by_number(21)
 UNITED_KINGDOM = flags.get_sprite_by_number(1)
@@ -3,6 +3,7 @@
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 
 FOLDER_PATH = 'game/map/files/'
+COMPILED_FOLDER_PATH = FOLDER_PATH + 'compiled/'
 
 # ====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====*====#
 #                                        PATHS TO LEVELS                                        #